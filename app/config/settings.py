@@ -77,6 +77,14 @@ class Settings(BaseSettings):
     OPENAI_PRESENCE_PENALTY: float = 0.0
     OPENAI_STOP: str = ""
     OPENAI_N: int = 1
+    # Optional model for short classification calls (category detection, brand context)
+    OPENAI_CLASSIFICATION_MODEL: str = ""
+
+    @computed_field
+    @property
+    def effective_classification_model(self) -> str:
+        """Model for classification calls; falls back to OPENAI_MODEL when unset."""
+        return self.OPENAI_CLASSIFICATION_MODEL.strip() or self.OPENAI_MODEL
 
     # OpenAI embedding settings
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
@@ -29,9 +29,12 @@ Architecture:
 from __future__ import annotations
 
 import re
-from collections import deque
+import threading
+from collections import Counter, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 
 from app.config.logger import app_logger
 from app.services.rjm_ingredient_canon import (
@@ -48,12 +51,24 @@ from app.services.rjm_ingredient_canon import (
     # Phase 1 Fix imports
     is_deprecated_persona,
     is_hot_persona,
-    get_rotation_weight,
+    get_rotation_weights,
+    register_recent,
     # Category pool (simplified - no hardcoded overlays)
     get_flexible_persona_pool,
 )
 
 
+# ALL_ANCHORS is a tuple upstream; use a frozenset for O(1) validation checks
+_ANCHOR_SET: frozenset[str] = frozenset(ALL_ANCHORS)
+
+# Reverse lookup: canonical generational segment → cohort
+_COHORT_BY_GENERATIONAL: Dict[str, str] = {
+    segment: cohort
+    for cohort, segments in GENERATIONS_BY_COHORT.items()
+    for segment in segments
+}
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # GLOBAL ROTATION STATE
 # Tracks recently used personas across sessions for freshness
@@ -63,43 +78,35 @@ _GLOBAL_RECENT_PERSONAS: deque[str] = deque(maxlen=200)
 _GLOBAL_RECENT_GENERATIONAL: deque[str] = deque(maxlen=60)
 _GLOBAL_RECENT_HIGHLIGHT_PERSONAS: deque[str] = deque(maxlen=40)
 
+# Membership mirrors of the deques, maintained by register_recent
+_GLOBAL_RECENT_PERSONAS_SET: Set[str] = set()
+_GLOBAL_RECENT_GENERATIONAL_SET: Set[str] = set()
+_GLOBAL_RECENT_HIGHLIGHT_PERSONAS_SET: Set[str] = set()
 
-def _register_used_personas(names: List[str]) -> None:
-    """Register personas as recently used for rotation."""
-    for name in names:
-        if name and name not in _GLOBAL_RECENT_PERSONAS:
-            _GLOBAL_RECENT_PERSONAS.append(name)
-
-
-def _register_used_generational(names: List[str]) -> None:
-    """Register generational segments as recently used."""
-    for name in names:
-        if name and name not in _GLOBAL_RECENT_GENERATIONAL:
-            _GLOBAL_RECENT_GENERATIONAL.append(name)
+# Request handlers share this state across threads; writers and deque snapshots hold the lock
+_GLOBAL_RECENT_LOCK = threading.Lock()
 
 
 def _register_used_highlights(names: List[str]) -> None:
     """Register highlight personas as recently used (for insight separation)."""
-    for name in names:
-        if name and name not in _GLOBAL_RECENT_HIGHLIGHT_PERSONAS:
-            _GLOBAL_RECENT_HIGHLIGHT_PERSONAS.append(name)
-
-
-def _is_recently_used(name: str) -> bool:
-    """Check if a persona was recently used."""
-    return name in _GLOBAL_RECENT_PERSONAS
+    with _GLOBAL_RECENT_LOCK:
+        register_recent(names, _GLOBAL_RECENT_HIGHLIGHT_PERSONAS, _GLOBAL_RECENT_HIGHLIGHT_PERSONAS_SET)
 
 
 def _is_recently_highlighted(name: str) -> bool:
     """Check if a persona was recently used in highlights."""
-    return name in _GLOBAL_RECENT_HIGHLIGHT_PERSONAS
+    return name in _GLOBAL_RECENT_HIGHLIGHT_PERSONAS_SET
 
 
 def clear_rotation_state() -> None:
     """Clear all rotation state (useful for testing)."""
-    _GLOBAL_RECENT_PERSONAS.clear()
-    _GLOBAL_RECENT_GENERATIONAL.clear()
-    _GLOBAL_RECENT_HIGHLIGHT_PERSONAS.clear()
+    with _GLOBAL_RECENT_LOCK:
+        _GLOBAL_RECENT_PERSONAS.clear()
+        _GLOBAL_RECENT_GENERATIONAL.clear()
+        _GLOBAL_RECENT_HIGHLIGHT_PERSONAS.clear()
+        _GLOBAL_RECENT_PERSONAS_SET.clear()
+        _GLOBAL_RECENT_GENERATIONAL_SET.clear()
+        _GLOBAL_RECENT_HIGHLIGHT_PERSONAS_SET.clear()
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -130,35 +137,41 @@ class PersonaSelectionContext:
     _portfolio_set: Set[str] = field(default_factory=set)
     _highlight_set: Set[str] = field(default_factory=set)
     _insight_set: Set[str] = field(default_factory=set)
-    _phylum_counts: Dict[str, int] = field(default_factory=dict)
+    _phylum_counts: Counter[str] = field(default_factory=Counter)
     
     def add_to_portfolio(self, name: str) -> bool:
         """Add a persona to the portfolio if not already present."""
-        if name in self._portfolio_set:
+        # Single hash operation: the set only grows if the name is new
+        size = len(self._portfolio_set)
+        self._portfolio_set.add(name)
+        if len(self._portfolio_set) == size:
             return False
         self.selected_portfolio.append(name)
-        self._portfolio_set.add(name)
         
         # Track phylum for diversity
         phylum = get_persona_phylum(name)
         if phylum:
-            self._phylum_counts[phylum] = self._phylum_counts.get(phylum, 0) + 1
+            self._phylum_counts[phylum] += 1
         return True
     
     def add_to_highlights(self, name: str) -> bool:
         """Add a persona to highlights if not already present."""
-        if name in self._highlight_set:
+        size = len(self._highlight_set)
+        self._highlight_set.add(name)
+        if len(self._highlight_set) == size:
             return False
         self.selected_highlights.append(name)
-        self._highlight_set.add(name)
         return True
     
     def add_to_insights(self, name: str) -> bool:
         """Add a persona to insights if not already present and not in highlights."""
-        if name in self._insight_set or name in self._highlight_set:
+        if name in self._highlight_set:
             return False
-        self.selected_insights.append(name)
+        size = len(self._insight_set)
         self._insight_set.add(name)
+        if len(self._insight_set) == size:
+            return False
+        self.selected_insights.append(name)
         return True
     
     def is_in_portfolio(self, name: str) -> bool:
@@ -169,18 +182,36 @@ class PersonaSelectionContext:
         """Check if a persona is used in highlights."""
         return name in self._highlight_set
     
-    def get_phylum_distribution(self) -> Dict[str, int]:
-        """Get current phylum distribution."""
-        return dict(self._phylum_counts)
+    def get_phylum_distribution(self) -> Mapping[str, int]:
+        """Get current phylum distribution (read-only live view)."""
+        return MappingProxyType(self._phylum_counts)
     
     def get_dominant_phylum_ratio(self) -> float:
         """Get the ratio of the most common phylum."""
         if not self._phylum_counts or not self.selected_portfolio:
             return 0.0
-        max_count = max(self._phylum_counts.values())
+        max_count = self._phylum_counts.most_common(1)[0][1]
         return max_count / len(self.selected_portfolio)
 
 
+@lru_cache(maxsize=128)
+def _get_pool_snapshot(
+    category: str,
+    brand_name: str,
+    brief: str,
+) -> Tuple[Tuple[str, ...], frozenset[str], frozenset[str]]:
+    """Build the immutable category pool structures for a PersonaAuthority.
+    
+    Several authorities are usually created for the same brand/brief within a
+    single generation, so the pool and its lookup sets are shared between them.
+    
+    Returns:
+        (pool, pool_set, canonical_pool_set)
+    """
+    pool = tuple(get_flexible_persona_pool(category, brand_name, brief))
+    return pool, frozenset(pool), frozenset(get_canonical_name(p) for p in pool)
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # PERSONA AUTHORITY
 # The main governance class that enforces all persona rules
@@ -220,8 +251,11 @@ class PersonaAuthority:
         self.max_phylum_dominance = max_phylum_dominance
         
         # Pure category pool (no hardcoded overlays - LLM handles meaning understanding)
-        self.category_pool = get_flexible_persona_pool(category, brand_name, brief)
-        self.category_pool_set = set(self.category_pool)
+        self.category_pool, self.category_pool_set, self._pool_canonical = _get_pool_snapshot(
+            category, brand_name, brief
+        )
+        # Allowed-persona filter results, keyed by the candidate list contents
+        self._allowed_cache: Dict[Tuple[str, ...], List[str]] = {}
 
         # Get category anchors
         self.anchors = get_dual_anchors(brand_name, category)
@@ -252,7 +286,23 @@ class PersonaAuthority:
             return True
 
         # Also allow if in the category pool (handles dual-anchor brands like Uber)
-        return canonical in self.category_pool_set or name in self.category_pool_set
+        return canonical in self._pool_canonical
+    
+    def _allowed_candidates(self, available_personas: List[str]) -> List[str]:
+        """Return non-deprecated, category-allowed personas from a candidate list.
+        
+        Highlights and insights are usually selected from the same list, so the
+        filtered result is cached per authority.
+        """
+        key = tuple(available_personas)
+        allowed = self._allowed_cache.get(key)
+        if allowed is None:
+            allowed = [
+                name for name in key
+                if not is_deprecated_persona(name) and self._is_allowed_persona(name)
+            ]
+            self._allowed_cache[key] = allowed
+        return allowed
     
     def validate_persona(self, name: str) -> Tuple[bool, str, Optional[str]]:
         """Validate a single persona against category constraints.
@@ -266,7 +316,7 @@ class PersonaAuthority:
             return False, name, "Empty name"
         
         # Skip anchors
-        if name in ALL_ANCHORS or name.startswith("RJM "):
+        if name in _ANCHOR_SET or name.startswith("RJM "):
             return False, name, "Anchor segment (not a core persona)"
         
         # Skip generational segments
@@ -299,24 +349,30 @@ class PersonaAuthority:
         
         Returns only the valid personas (in canonical form).
         """
-        valid = []
-        rejected = []
-        seen = set()
+        valid: List[str] = []
+        rejected: Optional[List[Tuple[str, Optional[str]]]] = [] if log_rejections else None
+        seen: Set[str] = set()
+        
+        # Bind hot-loop lookups locally
+        validate = self.validate_persona
+        add_seen = seen.add
+        append_valid = valid.append
         
         for name in persona_names:
-            is_valid, canonical, reason = self.validate_persona(name)
+            is_valid, canonical, reason = validate(name)
             
             if not is_valid:
-                rejected.append((name, reason))
+                if rejected is not None:
+                    rejected.append((name, reason))
                 continue
             
             if canonical in seen:
                 continue
             
-            seen.add(canonical)
-            valid.append(canonical)
+            add_seen(canonical)
+            append_valid(canonical)
         
-        if log_rejections and rejected:
+        if rejected:
             app_logger.warning(
                 f"PersonaAuthority rejected {len(rejected)} personas: "
                 f"{rejected[:5]}..."
@@ -362,22 +418,24 @@ class PersonaAuthority:
         
         # Build weighted candidate list with rotation pressure
         candidates = []
-        for name in available_personas:
-            # Skip deprecated personas
-            if is_deprecated_persona(name):
-                continue
-            
-            # Must be allowed via category guardrail or meaning overlays
-            if not self._is_allowed_persona(name):
-                continue
-            
-            # Calculate rotation weight
-            recency_pos = -1
-            if prefer_fresh and name in _GLOBAL_RECENT_HIGHLIGHT_PERSONAS:
-                recency_pos = list(_GLOBAL_RECENT_HIGHLIGHT_PERSONAS).index(name)
-            
-            weight = get_rotation_weight(name, self.category, recency_pos)
-            
+        # Skip deprecated personas; must be allowed via category guardrail or meaning overlays
+        allowed = self._allowed_candidates(available_personas)
+        
+        # Calculate rotation weights in one batch; recency is the first position in the queue
+        recent_positions: Dict[str, int] = {}
+        if prefer_fresh:
+            # Snapshot so a concurrent register cannot mutate the deque mid-iteration
+            with _GLOBAL_RECENT_LOCK:
+                recent = tuple(_GLOBAL_RECENT_HIGHLIGHT_PERSONAS)
+            for position, recent_name in enumerate(recent):
+                recent_positions.setdefault(recent_name, position)
+        weights = get_rotation_weights(
+            allowed,
+            self.category,
+            [recent_positions.get(name, -1) for name in allowed],
+        )
+        
+        for name, weight in zip(allowed, weights):
             # PHASE 1 FIX #1: Extra penalty if in global recent highlights
             if _is_recently_highlighted(name):
                 weight *= 0.5
@@ -436,29 +494,19 @@ class PersonaAuthority:
         # PHASE 1 FIX #2: Build explicit exclusion set from highlights
         highlight_exclusion = set(self.context.selected_highlights)
         
-        for name in available_personas:
+        # PHASE 1 FIX #2: HARD RULE - Must not be in highlights.
+        # Also avoid recently highlighted personas globally for freshness.
+        if must_be_different_from_highlights:
+            forbidden = self.context._highlight_set | _GLOBAL_RECENT_HIGHLIGHT_PERSONAS_SET
+        else:
+            forbidden = _GLOBAL_RECENT_HIGHLIGHT_PERSONAS_SET
+        
+        # Skip deprecated personas; must be allowed via category guardrail or meaning overlays
+        for name in self._allowed_candidates(available_personas):
             if len(selected) >= count:
                 break
             
-            # Skip deprecated personas
-            if is_deprecated_persona(name):
-                continue
-            
-            # Must be allowed via category guardrail or meaning overlays
-            if not self._is_allowed_persona(name):
-                continue
-            
-            # PHASE 1 FIX #2: HARD RULE - Must not be in highlights
-            if must_be_different_from_highlights:
-                if name in highlight_exclusion:
-                    app_logger.debug(f"Insight exclusion: '{name}' already in highlights")
-                    continue
-                if self.context.is_highlight_persona(name):
-                    app_logger.debug(f"Insight exclusion: '{name}' marked as highlight")
-                    continue
-            
-            # Also avoid recently highlighted personas globally for freshness
-            if _is_recently_highlighted(name):
+            if name in forbidden:
                 continue
             
             if self.context.add_to_insights(name):
@@ -508,11 +556,15 @@ class PersonaAuthority:
         
         persona_name = match.group(1)
         
-        # Handle pluralized persona names (e.g., "Caffeine Fiends" -> "Caffeine Fiend")
-        singular_name = persona_name.rstrip('s') if persona_name.endswith('s') and not persona_name.endswith('ss') else persona_name
-        # Also handle "ies" -> "y" plurals (e.g., "Buddies" -> "Buddy")
-        if singular_name.endswith('ie') and persona_name.endswith('ies'):
-            singular_name = singular_name[:-2] + 'y'
+        # Handle pluralized persona names:
+        # "ies" -> "y" (e.g., "Buddies" -> "Buddy"), otherwise drop one trailing "s"
+        # (e.g., "Caffeine Fiends" -> "Caffeine Fiend") unless it ends in "ss"
+        if persona_name.endswith('ies'):
+            singular_name = persona_name[:-3] + 'y'
+        elif persona_name.endswith('s') and not persona_name.endswith('ss'):
+            singular_name = persona_name.removesuffix('s')
+        else:
+            singular_name = persona_name
         
         # Try canonical lookup with both forms
         canonical = get_canonical_name(persona_name)
@@ -595,6 +647,23 @@ class PersonaAuthority:
         
         return insight_text
     
+    def _blocked_phyla(self) -> Tuple[Set[str], bool]:
+        """Return phyla whose next addition would break the dominance rule.
+        
+        The flag is True when even a phylum not yet in the portfolio would
+        exceed the limit (only possible for very small portfolios).
+        """
+        phylum_counts = self.context._phylum_counts
+        if len(phylum_counts) < self.min_phyla:
+            return set(), False
+        
+        new_total = len(self.context.selected_portfolio) + 1
+        blocked = {
+            phylum for phylum, count in phylum_counts.items()
+            if (count + 1) / new_total > self.max_phylum_dominance
+        }
+        return blocked, 1 / new_total > self.max_phylum_dominance
+    
     def build_portfolio(
         self,
         llm_personas: List[str],
@@ -620,13 +689,19 @@ class PersonaAuthority:
         
         if current_count < target_count:
             # Fill from category pool with rotation and diversity
-            available = [
-                name for name in self.category_pool
-                if name not in self.context._portfolio_set
-            ]
+            # Partition by freshness (non-recent first), keeping pool order within each group
+            fresh: List[str] = []
+            stale: List[str] = []
+            portfolio_set = self.context._portfolio_set
+            recent = _GLOBAL_RECENT_PERSONAS_SET
+            for name in self.category_pool:
+                if name in portfolio_set:
+                    continue
+                (stale if name in recent else fresh).append(name)
+            available = fresh + stale
             
-            # Sort by freshness (non-recent first)
-            available.sort(key=lambda p: (1 if _is_recently_used(p) else 0))
+            # Phyla that would violate the dominance rule; only changes when a persona is added
+            blocked_phyla, block_unseen = self._blocked_phyla()
             
             for name in available:
                 if len(self.context.selected_portfolio) >= target_count:
@@ -634,26 +709,23 @@ class PersonaAuthority:
                 
                 # Check phylum diversity
                 phylum = get_persona_phylum(name)
-                if phylum:
-                    phylum_count = self.context._phylum_counts.get(phylum, 0)
-                    new_count = phylum_count + 1
-                    new_total = len(self.context.selected_portfolio) + 1
-                    new_ratio = new_count / new_total
-                    
-                    # Skip if this would violate dominance rule
-                    if new_ratio > self.max_phylum_dominance and len(self.context._phylum_counts) >= self.min_phyla:
-                        continue
+                if phylum and (
+                    phylum in blocked_phyla
+                    or (block_unseen and phylum not in self.context._phylum_counts)
+                ):
+                    continue
                 
-                self.context.add_to_portfolio(name)
+                if self.context.add_to_portfolio(name):
+                    blocked_phyla, block_unseen = self._blocked_phyla()
         
         # Register for rotation
-        _register_used_personas(self.context.selected_portfolio)
+        with _GLOBAL_RECENT_LOCK:
+            register_recent(self.context.selected_portfolio, _GLOBAL_RECENT_PERSONAS, _GLOBAL_RECENT_PERSONAS_SET)
         
         # Log diversity stats
-        phylum_dist = self.context.get_phylum_distribution()
         app_logger.info(
             f"Built portfolio: {len(self.context.selected_portfolio)} personas, "
-            f"{len(phylum_dist)} phyla, dominance={self.context.get_dominant_phylum_ratio():.2f}"
+            f"{len(self.context._phylum_counts)} phyla, dominance={self.context.get_dominant_phylum_ratio():.2f}"
         )
         
         return list(self.context.selected_portfolio)
@@ -676,11 +748,7 @@ class PersonaAuthority:
                 continue
             
             # Determine cohort
-            cohort = None
-            for c in GENERATIONS_BY_COHORT.keys():
-                if canonical.startswith(c):
-                    cohort = c
-                    break
+            cohort = _COHORT_BY_GENERATIONAL.get(canonical)
             
             if cohort and cohort not in cohorts_covered:
                 selected.append(canonical)
@@ -694,7 +762,7 @@ class PersonaAuthority:
             
             # Prefer non-recent segments
             for seg in segments:
-                if seg not in _GLOBAL_RECENT_GENERATIONAL:
+                if seg not in _GLOBAL_RECENT_GENERATIONAL_SET:
                     selected.append(seg)
                     cohorts_covered.add(cohort)
                     self.context.selected_generational.append(seg)
@@ -706,7 +774,8 @@ class PersonaAuthority:
                 self.context.selected_generational.append(segments[0])
         
         # Register for rotation
-        _register_used_generational(selected)
+        with _GLOBAL_RECENT_LOCK:
+            register_recent(selected, _GLOBAL_RECENT_GENERATIONAL, _GLOBAL_RECENT_GENERATIONAL_SET)
         
         return selected[:4]  # Max 4 (one per cohort)
     
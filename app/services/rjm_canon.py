@@ -1,18 +1,16 @@
 """
 Utilities for loading RJM canon persona names from the ingredient canon.
 
-This module now primarily wraps rjm_ingredient_canon.py (RJM INGREDIENT CANON 11.26.25).
-Legacy file-based loading is retained as fallback for backward compatibility.
+This module wraps rjm_ingredient_canon.py (RJM INGREDIENT CANON 11.26.25).
+
+All derived values are computed once at import; the getters simply return them.
 """
 
 from __future__ import annotations
 
-from functools import lru_cache
-from pathlib import Path
-from typing import Dict, List, Set
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Final, Mapping, Tuple
 
-from app.config.logger import app_logger
-from app.config.settings import settings
 from app.services.rjm_ingredient_canon import (
     PERSONA_TO_PHYLUM,
     PHYLUM_PERSONA_MAP,
@@ -23,67 +21,67 @@ from app.services.rjm_ingredient_canon import (
 )
 
 
-def _safe_read(path: Path) -> List[str]:
-    try:
-        text = path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        text = path.read_text(encoding="latin-1")
-    return text.splitlines()
+# Parallel name/phylum tuples, sorted by persona name
+_NAMES_SORTED, _PHYLUMS_SORTED = zip(*sorted(PERSONA_TO_PHYLUM.items()))
+
+_CANON_NAMES: Final[Tuple[str, ...]] = _NAMES_SORTED
+_PROMPT_LIST: Final[Tuple[str, ...]] = tuple(
+    f"{name} ({phylum})" for name, phylum in zip(_NAMES_SORTED, _PHYLUMS_SORTED)
+)
+# rjm_rag always joins with ", "; build that block once
+_PROMPT_BLOCK_SEP: Final[str] = ", "
+_PROMPT_BLOCK: Final[str] = _PROMPT_BLOCK_SEP.join(_PROMPT_LIST)
+_PERSONA_TO_PHYLUM_VIEW: Final[Mapping[str, str]] = MappingProxyType(PERSONA_TO_PHYLUM)
+_PHYLUM_PERSONA_MAP_VIEW: Final[Mapping[str, Tuple[str, ...]]] = MappingProxyType(PHYLUM_PERSONA_MAP)
 
 
-@lru_cache(maxsize=1)
-def get_canon_persona_map() -> Dict[str, str]:
-    """Return mapping of persona_name -> phylum from RJM Ingredient Canon."""
-    app_logger.info(f"Loaded {len(PERSONA_TO_PHYLUM)} canon personas with phylum mapping from Ingredient Canon")
-    return PERSONA_TO_PHYLUM
+def get_canon_persona_map() -> Mapping[str, str]:
+    """Return a read-only mapping of persona_name -> phylum from RJM Ingredient Canon."""
+    return _PERSONA_TO_PHYLUM_VIEW
 
 
-@lru_cache(maxsize=1)
-def get_canon_persona_names() -> List[str]:
-    """Return a sorted list of canon persona names for prompting."""
-    names = sorted(PERSONA_TO_PHYLUM.keys())
-    app_logger.info(f"Loaded {len(names)} canon persona names for prompting")
-    return names
+def get_canon_persona_names() -> Tuple[str, ...]:
+    """Return a sorted tuple of canon persona names for prompting."""
+    return _CANON_NAMES
 
 
-@lru_cache(maxsize=1)
-def get_canon_persona_prompt_list() -> List[str]:
+def get_canon_persona_prompt_list() -> Tuple[str, ...]:
     """Return persona names annotated with their phylum for prompt conditioning."""
-    return [f"{name} ({phylum})" for name, phylum in sorted(PERSONA_TO_PHYLUM.items())]
+    return _PROMPT_LIST
+
+
+def get_canon_persona_prompt_block(sep: str = _PROMPT_BLOCK_SEP) -> str:
+    """Return persona names annotated with their phylum, joined into one prompt string."""
+    if sep == _PROMPT_BLOCK_SEP:
+        return _PROMPT_BLOCK
+    return sep.join(_PROMPT_LIST)
 
 
-@lru_cache(maxsize=1)
-def get_generational_by_phylum() -> Dict[str, List[str]]:
+def get_generational_by_phylum() -> Dict[str, Tuple[str, ...]]:
     """
     Return generational segments organized by cohort.
     
     Note: In the new Ingredient Canon, generations are organized by cohort (Gen Z, Millennial, etc.)
     rather than by persona phylum. This function now returns cohort-based grouping.
     """
-    app_logger.info(f"Loaded generational anchors for {len(GENERATIONS_BY_COHORT)} cohorts")
     return GENERATIONS_BY_COHORT
 
 
-@lru_cache(maxsize=1)
-def get_all_generational_names() -> Set[str]:
+def get_all_generational_names() -> AbstractSet[str]:
     """Return all generational segment names."""
     return ALL_GENERATIONAL_NAMES
 
 
-@lru_cache(maxsize=1)
 def get_generational_descriptions() -> Dict[str, str]:
     """Return generational segment names with their descriptions."""
     return GENERATIONS
 
 
-@lru_cache(maxsize=1)
-def get_local_culture_personas() -> List[str]:
+def get_local_culture_personas() -> Tuple[str, ...]:
     """Return Local Culture DMA segment names."""
-    app_logger.info(f"Loaded {len(LOCAL_CULTURE_DMAS)} local culture DMA segments")
     return LOCAL_CULTURE_DMAS
 
 
-@lru_cache(maxsize=1)
-def get_phylum_persona_map() -> Dict[str, List[str]]:
-    """Return phylum -> list of personas mapping."""
-    return PHYLUM_PERSONA_MAP
+def get_phylum_persona_map() -> Mapping[str, Tuple[str, ...]]:
+    """Return a read-only phylum -> personas mapping."""
+    return _PHYLUM_PERSONA_MAP_VIEW
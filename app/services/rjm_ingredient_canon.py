@@ -21,11 +21,22 @@ PHASE 1 FIXES (per Jesse's feedback):
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import heapq
+import json
 import random
-from collections import deque
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from app.config.logger import app_logger
+from app.config.settings import settings
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -34,7 +45,7 @@ from app.config.logger import app_logger
 # They MUST NOT appear in any generated programs.
 # ════════════════════════════════════════════════════════════════════════════
 
-DEPRECATED_PERSONAS: Set[str] = {
+DEPRECATED_PERSONAS: FrozenSet[str] = frozenset({
     # Legacy personas retired from canon
     "Culture Maven",  # Replaced by Culture Connoisseur
     "Money Mover",    # Consolidated into Power Broker
@@ -70,7 +81,7 @@ DEPRECATED_PERSONAS: Set[str] = {
     "Car Enthusiast", # Consolidated into Revved / Fast Lane
     "Pet Parent",     # Consolidated into Dog Parent / Cat Person / Pawrent
     "Animal Lover",   # Consolidated into Rescuer
-}
+})
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -271,7 +282,7 @@ BRAND_CATEGORY_OVERRIDES: Dict[str, str] = {
 }
 
 # Meaning-based overlay persona sets (used to loosen category hard-lock for edge briefs)
-PET_SERVICE_PERSONAS: Set[str] = {
+PET_SERVICE_PERSONAS: FrozenSet[str] = frozenset({
     # Core pet personas (PRIORITIZE THESE)
     "Dog Parent", "Cat Person", "Rescuer", "Pack Leader", "Petfluencer",
     "Pawrent", "Best in Show", "Lulu",
@@ -281,9 +292,9 @@ PET_SERVICE_PERSONAS: Set[str] = {
     "Caregiver", "Single Parent", "Empty Nester",
     # Outdoor / active with pets
     "Nature Lover", "Hiker", "Trailblazer", "Morning Stroll", "Weekend Warrior",
-}
+})
 
-EDUCATION_PERSONAS: Set[str] = {
+EDUCATION_PERSONAS: FrozenSet[str] = frozenset({
     # Core education & growth personas (PRIORITIZE THESE)
     "Scholar", "Reader", "Writer", "Coach", "Mentor", "Planner", "Self-Love",
     "Modern Monk", "Optimist", "Journey", "Legacy",
@@ -293,9 +304,9 @@ EDUCATION_PERSONAS: Set[str] = {
     "Digital Nomad", "Techie",
     # Career growth (use sparingly - not the primary audience)
     "Builder", "Innovator", "Entrepreneur",
-}
+})
 
-CIVIC_PERSONAS: Set[str] = {
+CIVIC_PERSONAS: FrozenSet[str] = frozenset({
     # Community & local pride (PRIORITIZE THESE)
     "Neighborhood Watch", "Volunteer", "Main Street", "PTA", "Mayor",
     "Hometown Hero", "Southern Hospitality",
@@ -305,7 +316,7 @@ CIVIC_PERSONAS: Set[str] = {
     "Potomac Power", "Social Architect", "Journey",
     # Practical voters
     "Planner", "Caregiver", "Single Parent", "Empty Nester",
-}
+})
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -315,59 +326,75 @@ CIVIC_PERSONAS: Set[str] = {
 # ════════════════════════════════════════════════════════════════════════════
 
 # Per-category "hot" personas that need rotation pressure (Phase 1 Fix #1)
-CATEGORY_HOT_PERSONAS: Dict[str, Set[str]] = {
-    "Travel & Hospitality": {
+CATEGORY_HOT_PERSONAS: Dict[str, FrozenSet[str]] = {
+    "Travel & Hospitality": frozenset({
         "Romantic Voyager", "Retreat Seeker", "Island Hopper",
-    },
-    "Luxury & Fashion": {
+    }),
+    "Luxury & Fashion": frozenset({
         "Closet Runway", "Fast Fashionista", "Couture Curator",
-    },
-    "CPG": {
+    }),
+    "CPG": frozenset({
         "Budget-Minded", "Savvy Shopper", "Bargain Hunter",
-    },
-    "QSR": {
+    }),
+    "QSR": frozenset({
         "Takeout Guru", "Food Truckin'", "Caffeine Fiend",
-    },
-    "Retail & E-Commerce": {
+    }),
+    "Retail & E-Commerce": frozenset({
         "Bargain Hunter", "Budget-Minded", "Savvy Shopper", "Impulse Buyer",
-    },
-    "Finance & Insurance": {
+    }),
+    "Finance & Insurance": frozenset({
         "Power Broker", "Planner", "Legacy",
-    },
-    "Tech & Wireless": {
+    }),
+    "Tech & Wireless": frozenset({
         "Techie", "Digital Nomad", "Gamer",
-    },
-    "Entertainment": {
+    }),
+    "Entertainment": frozenset({
         "Binge Watcher", "Creator", "Gamer",
-    },
-    "Sports & Fitness": {
+    }),
+    "Sports & Fitness": frozenset({
         "Gym Obsessed", "Weekend Warrior", "Sports Parent",
-    },
-    "Culinary & Dining": {
+    }),
+    "Culinary & Dining": frozenset({
         "Chef", "Bourdain Mode", "Foodie",
-    },
-    "Health & Pharma": {
+    }),
+    "Health & Pharma": frozenset({
         "Self-Love", "Biohacker", "Gym Obsessed",
-    },
-    "Auto": {
+    }),
+    "Auto": frozenset({
         "Road Trip", "Weekend Warrior", "Fast Lane",
-    },
-    "Home & DIY": {
+    }),
+    "Home & DIY": frozenset({
         "Fixer", "Modern Tradesman", "Design Maven",
-    },
-    "Alcohol & Spirits": {
+    }),
+    "Alcohol & Spirits": frozenset({
         "Nightcapper", "Social Butterfly", "Night Owl",
-    },
+    }),
 }
 
+_EMPTY_FROZENSET: FrozenSet[str] = frozenset()
+
 
 def is_hot_persona(name: str, category: str) -> bool:
     """Check if a persona is a 'hot' persona for the given category.
     
     Hot personas are frequently selected and need rotation pressure.
     """
-    hot_set = CATEGORY_HOT_PERSONAS.get(category, set())
-    return name in hot_set
+    return name in CATEGORY_HOT_PERSONAS.get(category, _EMPTY_FROZENSET)
+
+
+def _hot_persona_weight(category: str) -> float:
+    """Rotation weight applied to a hot persona in this category."""
+    if category == "Travel & Hospitality":
+        # PHASE 1 FIX: Extra strong penalty for Travel hot personas
+        # This breaks the Romantic Voyager / Retreat Seeker / Island Hopper cluster
+        return 0.25  # 75% penalty for Travel hot personas
+    return 0.6  # 40% penalty for being a "hot" persona
+
+
+# Recency penalty by position in the recent-usage queue:
+# very recent (<20) x0.3, moderately recent (<50) x0.5, somewhat recent (<100) x0.7
+_RECENCY_WEIGHTS: Tuple[float, ...] = (0.3,) * 20 + (0.5,) * 30 + (0.7,) * 50
+_RECENCY_WEIGHT_SPAN = len(_RECENCY_WEIGHTS)
 
 
 def get_rotation_weight(name: str, category: str, recency_position: int = -1) -> float:
@@ -385,40 +412,50 @@ def get_rotation_weight(name: str, category: str, recency_position: int = -1) ->
     
     # Hot persona penalty - STRONGER for Travel & Hospitality to break the clustering
     if is_hot_persona(name, category):
-        if category == "Travel & Hospitality":
-            # PHASE 1 FIX: Extra strong penalty for Travel hot personas
-            # This breaks the Romantic Voyager / Retreat Seeker / Island Hopper cluster
-            weight *= 0.25  # 75% penalty for Travel hot personas
-        else:
-            weight *= 0.6  # 40% penalty for being a "hot" persona
-    
-    # Recency penalty (if recently used)
-    if recency_position >= 0:
-        if recency_position < 20:  # Very recently used
-            weight *= 0.3
-        elif recency_position < 50:  # Moderately recent
-            weight *= 0.5
-        elif recency_position < 100:  # Somewhat recent
-            weight *= 0.7
+        weight = _hot_persona_weight(category)
+    
+    # Recency penalty (if recently used) - one table lookup instead of a branch ladder
+    if 0 <= recency_position < _RECENCY_WEIGHT_SPAN:
+        weight *= _RECENCY_WEIGHTS[recency_position]
     
     return max(0.1, weight)  # Never go below 0.1
 
 
+def get_rotation_weights(
+    names: Sequence[str],
+    category: str,
+    recency_positions: Sequence[int],
+) -> List[float]:
+    """Batch form of get_rotation_weight for scoring a whole candidate list.
+    
+    The category's hot set and penalty are resolved once rather than per persona.
+    """
+    hot_set = CATEGORY_HOT_PERSONAS.get(category, _EMPTY_FROZENSET)
+    hot_weight = _hot_persona_weight(category)
+    weights: List[float] = []
+    for name, recency_position in zip(names, recency_positions):
+        weight = hot_weight if name in hot_set else 1.0
+        if 0 <= recency_position < _RECENCY_WEIGHT_SPAN:
+            weight *= _RECENCY_WEIGHTS[recency_position]
+        weights.append(max(0.1, weight))
+    return weights
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # SECTION I — CATEGORY → PERSONA MAP
 # Primary Selector — The First Layer of Every Persona Program
 # ════════════════════════════════════════════════════════════════════════════
 
-CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
+CATEGORY_PERSONA_MAP: Dict[str, Tuple[str, ...]] = {
     # B2B & Professional Services - for martech, data companies, SaaS, enterprise
-    "B2B & Professional Services": [
+    "B2B & Professional Services": (
         "Power Broker", "Boss", "Visionary", "Palo Alto", "Upstart", "Prime Mover", "Disruptor",
         "Maverick", "Trader", "Entrepreneur", "Builder", "Innovator", "Scholar", "Techie",
         "Digital Nomad", "Architect", "Potomac Power", "Gordon Gecko", "Planner", "Legacy",
         "LeBron", "Matador", "QB", "Coach", "Mentor", "Modern Monk", "Reader", "Writer",
         "Journey", "Morning Commute", "After Hours", "Sideways", "Trailblazer",
-    ],
-    "CPG": [
+    ),
+    "CPG": (
         "Budget-Minded", "Bargain Hunter", "Savvy Shopper", "Planner", "Single Parent", "Caregiver",
         "New Parent", "Weekend Warrior", "Gifter", "Road Trip", "Chef", "Garden Gourmet", "Self-Love",
         "Optimist", "Alchemist", "Impulse Buyer", "Cultural Harmonist", "Legacy", "The Fixer", "Retiree", "Julia",
@@ -427,8 +464,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Sweet Tooth", "Gift Wrap", "Family Table", "Sunday Reset", "Morning Commute", "After Hours",
         "Host", "Holiday Table", "Trailblazer", "Faith", "Believer", "Off the Grid", "Neighborhood Watch",
         "Volunteer", "PTA", "Pack Leader", "Cat Person", "Dog Parent", "Rescuer",
-    ],
-    "Tech & Wireless": [
+    ),
+    "Tech & Wireless": (
         "Techie", "Influencer", "Gamer", "Visionary", "Digital Nomad", "Power Broker", "Luxury Insider",
         "Creator", "Maverick", "Timothee", "Fast Fashionista", "Closet Runway", "Sneakerhead", "Stylista",
         "Hype Seeker", "Boss", "Palo Alto", "Upstart", "Prime Mover", "Hollywood Hills", "Bond Tripper",
@@ -437,8 +474,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Reader", "Writer", "Scholar", "Modern Monk", "Trailblazer", "Speedrunner", "Streamer Mode",
         "Controller Drop", "LAN Party", "Modder", "Quest Log", "AFK Life", "Vinyl", "EDM Afterlife",
         "Rap Caviar", "Stargazer", "Late Checkout", "Morning Commute", "Payday", "Journey",
-    ],
-    "Culinary & Dining": [
+    ),
+    "Culinary & Dining": (
         "Taco Run", "Breakfast Burrito", "Pizza Night", "Sweet Tooth", "Cold Brew", "Sideways",
         "Holiday Table", "Family Table", "Gift Wrap", "Host", "Night In", "Cheers", "Big Date", "Holiday Hang",
         "Faith", "Believer", "Sanctuary", "Sunday Reset", "Morning Commute", "After Hours", "First Date",
@@ -446,8 +483,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Takeout Guru", "Pit Master", "Michelin Chaser", "Bourdain Mode", "Caffeine Fiend", "Nightcapper",
         "Social Butterfly", "Austin Unplugged", "Romantic Voyager", "Miami Vibe", "Gatsby", "Bourbon Streeter",
         "Design Maven", "Chef", "Adrenaline Junkie", "Influencer", "Night Owl", "Sports Parent", "Southern Hospitality",
-    ],
-    "Auto": [
+    ),
+    "Auto": (
         "Revved", "Fast Lane", "Road Trip", "Planner", "Weekend Warrior", "Tailgater", "Sports Parent",
         "Luxury Insider", "Green Pioneer", "Modern Tradesman", "Legacy", "Empty Nester", "Bond Tripper",
         "Malibu Nomad", "Upstart", "Boss", "Power Broker", "Fantasy GM", "Disruptor", "Vegas High Roller",
@@ -455,8 +492,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Country Club", "Tiger", "Morning Stroll", "Neighborhood Watch", "Main Street", "Mayor", "PTA",
         "Hometown Hero", "Red Rockin'", "Motowner", "Beats", "Kendrick", "Soundcheck", "Festivalgoer",
         "Rest Stop", "Mentor", "Luke", "Seinfeld",
-    ],
-    "Entertainment": [
+    ),
+    "Entertainment": (
         "Binge Watcher", "Creator", "Gamer", "Influencer", "Night Owl", "Cultural Enthusiast", "Social Butterfly",
         "Digital Nomad", "Timothee", "Madonna", "Beyoncé", "Tarantino", "Old Soul", "Sneakerhead", "Beats",
         "Backpacker", "Closet Runway", "Single Parent", "PreChecker", "Weekend Warrior", "Gatsby",
@@ -464,8 +501,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Seinfeld", "Vinyl", "Backstage Pass", "Performer", "Mentor", "Luke", "Kendrick", "Writer",
         "Reader", "Night In", "After Hours", "Morning Commute", "Family Table", "Cheers", "Big Date",
         "Holiday Hang", "Streamer Mode",
-    ],
-    "Travel & Hospitality": [
+    ),
+    "Travel & Hospitality": (
         "Romantic Voyager", "Retreat Seeker", "Island Hopper", "Backpacker", "PreChecker",
         "Malibu Nomad", "Free Thinker", "Southern Hospitality", "Late Checkout", "First Date",
         "Holiday Hang", "Reel Life", "Nature Lover", "Stargazer", "Trailblazer", "Off the Grid", "Country Mile",
@@ -474,8 +511,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Pack Leader", "Dog Parent", "Cat Person", "Rescuer", "Empty Nester", "Weekend Warrior",
         "Road Trip", "Beach Bum", "Bourdain Mode", "Planner", "Digital Nomad", "Bond Tripper", "Miami Vibe",
         "Gatsby", "Hemingway", "Old Soul", "Social Architect", "Adrenaline Junkie", "Luxury Insider",
-    ],
-    "Retail & E-Commerce": [
+    ),
+    "Retail & E-Commerce": (
         "Bargain Hunter", "Budget-Minded", "Savvy Shopper", "Planner", "Impulse Buyer", "Empty Nester",
         "Single Parent", "Split Family", "Modern Tradesman", "Point Warrior", "Gifter", "Sneakerhead",
         "Closet Runway", "Stylista", "Fast Fashionista", "Vintage Stylist", "Collector", "Design Maven",
@@ -484,47 +521,47 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Backstage Pass", "Dog Parent", "Cat Person", "Rescuer", "Pack Leader", "Faith", "Believer",
         "Off the Grid", "Payday", "Sunday Reset", "Morning Commute", "After Hours", "Family Table",
         "Holiday Hang", "Host",
-    ],
-    "Health & Pharma": [
+    ),
+    "Health & Pharma": (
         "Self-Love", "The Alchemist", "Gym Obsessed", "Sculpt", "Biohacker", "Caregiver", "Retiree",
         "Empty Nester", "Legacy", "Single Parent", "Planner", "Weekend Warrior", "Clean Eats", "Detox",
         "Stretch", "Step Counter", "Hydrating", "Morning Stroll", "Sanctuary", "Believer", "Faith", "Journey",
         "Nature Lover", "Country Mile", "Sunday Reset", "Morning Commute", "After Hours", "Night In", "Host",
         "Hiker", "Campfire", "Trailblazer", "Modern Monk", "Golden Age", "Optimist", "Old Soul", "Oprah",
-    ],
-    "Finance & Insurance": [
+    ),
+    "Finance & Insurance": (
         "Power Broker", "Boss", "QB", "Gordon Gecko", "Upstart", "Potomac Power", "Palo Alto",
         "Planner", "Legacy", "Point Warrior", "Prime Mover", "Crypto Bro", "Disruptor", "LeBron", "Matador",
         "Visionary", "Techie", "Empty Nester", "Single Parent", "Golden Age", "Trader", "Innovator",
         "Entrepreneur", "Builder", "Scholar", "Reader", "Writer", "Modern Monk", "Pilgrim", "Journey",
         "Sanctuary", "Faith", "Believer", "Payday", "First Date", "Late Checkout", "Morning Commute", "After Hours",
         "Family Table", "Mentor", "Luke", "Hometown Hero", "Sideways", "Trailblazer", "Sunday Reset",
-    ],
-    "Home & DIY": [
+    ),
+    "Home & DIY": (
         "Modern Tradesman", "Fixer", "Legacy", "Architect", "Renovator", "Design Maven", "Garden Gourmet",
         "Boss", "Empty Nester", "Planner", "Budget-Minded", "Collector", "Green Pioneer",
         "Single Parent", "Old Soul", "Nashville Dream", "Builder", "Host", "Family Table", "Holiday Table",
         "Believer", "Holiday Hang", "Gift Wrap", "After Hours", "Morning Commute", "Sunday Reset",
         "Off the Grid", "Nature Lover", "Trailblazer", "Stargazer", "Dog Parent", "Cat Person", "Rescuer",
         "Pack Leader", "Reader", "Writer", "Innovator", "Ribeye", "Sideways", "First Date", "Payday", "Trader",
-    ],
-    "Luxury & Fashion": [
+    ),
+    "Luxury & Fashion": (
         "Closet Runway", "Fast Fashionista", "Couture Curator", "Stylista", "Hype Seeker", "Glam Life",
         "Sneakerhead", "Collector", "Luxury Insider", "Devil Wears", "Culture Connoisseur", "Sideways",
         "First Date", "Big Date", "Cheers", "Holiday Table", "Holiday Hang", "Gift Wrap", "Vinyl", "Backstage Pass",
         "Hometown Hero", "Trailblazer", "Performer", "Morning Commute", "After Hours", "Lulu",
         "Swiftie", "Red Rockin'", "Seinfeld", "Night In", "Host", "Best in Show", "Miami Vibe", "Jenny from the Block",
         "Hampton's Charm", "Socialite", "Hollywood Hills", "Design Maven", "Boss", "Influencer",
-    ],
-    "Sports & Fitness": [
+    ),
+    "Sports & Fitness": (
         "Gym Obsessed", "Elite Competitor", "Sculpt", "Sports Parent", "Weekend Warrior", "Fantasy GM",
         "Rackets", "Basketball Junkie", "Gamer", "Coach", "QB", "LeBron", "Biohacker", "Prime Mover",
         "Game Day", "Morning Stroll", "Tiger", "Campfire", "Hiker", "Country Mile", "Trailblazer", "Stargazer",
         "Nature Lover", "Off the Grid", "Step Counter", "Stretch", "Hydrating", "Detox", "Clean Eats", "Sunday Reset",
         "After Hours", "Morning Commute", "Family Table", "Host", "Pack Leader", "Dog Parent", "Cat Person", "Rescuer",
         "Petfluencer", "Best in Show", "Fast Lane", "Sneakerhead", "Matador", "Boss", "Power Broker", "Lasso", "Adrenaline Junkie",
-    ],
-    "Alcohol & Spirits": [
+    ),
+    "Alcohol & Spirits": (
         "Nightcapper", "Bourbon Streeter", "Beer League", "Pit Master", "Tailgater", "Bartender", "Chef",
         "Social Butterfly", "Night Owl", "Miami Vibe", "Vegas High Roller", "Bond Tripper", "Influencer",
         "Southern Hospitality", "Bourdain Mode", "Food Truckin'", "Glam Life", "Gatsby", "Old Soul",
@@ -533,8 +570,8 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Payday", "Sideways", "Ribeye", "Trailblazer", "Performer", "Backstage Pass", "Vinyl",
         "Rap Caviar", "EDM Afterlife", "Coachella Mind", "Red Rockin'", "Swiftie", "Gift Wrap", "Petfluencer",
         "Pawrent", "Best in Show",
-    ],
-    "QSR": [
+    ),
+    "QSR": (
         "Takeout Guru", "Food Truckin'", "Caffeine Fiend", "Gamer", "Sneakerhead", "Night Owl",
         "Beer League", "Single Parent", "Southern Hospitality", "Road Trip", "Bargain Hunter",
         "Budget-Minded", "Impulse Buyer", "Backpacker", "Digital Nomad", "Fantasy GM", "Tailgater",
@@ -542,8 +579,18 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
         "Sides Only", "Cold Brew", "Breakfast Burrito", "Clean Eats", "Detox", "Stretch", "Step Counter",
         "Neighborhood Watch", "Block Party", "Main Street", "Volunteer", "The Mayor", "PTA", "Red Rockin'",
         "Swiftie", "Coachella Mind", "Game Day", "Midnight Run",
-    ],
+    ),
+}
+
+# Build reverse lookup: persona name → categories that list it
+_persona_categories: Dict[str, Set[str]] = {}
+for _category, _category_personas in CATEGORY_PERSONA_MAP.items():
+    for _persona in _category_personas:
+        _persona_categories.setdefault(_persona, set()).add(_category)
+PERSONA_TO_CATEGORIES: Dict[str, FrozenSet[str]] = {
+    persona: frozenset(categories) for persona, categories in _persona_categories.items()
 }
+del _persona_categories
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -551,96 +598,105 @@ CATEGORY_PERSONA_MAP: Dict[str, List[str]] = {
 # Ensures persona diversity, cultural dimensionality, and prevents over-clustering
 # ════════════════════════════════════════════════════════════════════════════
 
-PHYLUM_PERSONA_MAP: Dict[str, List[str]] = {
-    "Sports & Competition": [
+PHYLUM_PERSONA_MAP: Dict[str, Tuple[str, ...]] = {
+    "Sports & Competition": (
         "LeBron", "QB", "Lasso", "Basketball Junkie", "Sculpt", "Sports Parent", "Sports Enthusiast",
         "Beer League", "Tailgater", "Elite Competitor", "Fantasy GM", "Rackets", "Adrenaline Junkie", "Tiger",
-    ],
-    "Gaming & Interactive": [
+    ),
+    "Gaming & Interactive": (
         "Gamer", "LAN Party", "Speedrunner", "AFK Life", "Streamer Mode", "Modder", "Controller Drop", "Quest Log",
-    ],
-    "Food & Culinary": [
+    ),
+    "Food & Culinary": (
         "Chef", "Pit Master", "Bourdain Mode", "Michelin Chaser", "Garden Gourmet", "Nightcapper", "Takeout Guru",
         "Food Truckin'", "Caffeine Fiend", "Bartender", "Taco Run", "Extra Fries", "Sauce", "Midnight Run",
         "Burger Fiend", "Breakfast Burrito", "Sweet Tooth", "Sides Only", "Sideways", "Cold Brew", "Pizza Night",
-    ],
-    "Wellness & Body Culture": [
+    ),
+    "Wellness & Body Culture": (
         "Biohacker", "Optimist", "Gym Obsessed", "Detox", "Stretching", "Stretch", "Hydrating", "Morning Stroll",
         "Clean Eats", "Step Counter", "Self-Love",
-    ],
-    "Style & Fashion": [
+    ),
+    "Style & Fashion": (
         "Stylista", "Fast Fashionista", "Closet Runway", "Vintage Stylist", "Sneakerhead", "Maven", "Glam Life",
         "Couture Curator", "Devil Wears", "Streetwear Soul", "Hype Seeker",
-    ],
-    "Luxury & Affluence": [
+    ),
+    "Luxury & Affluence": (
         "Luxury Insider", "Hollywood Hills", "Miami Vibe", "Socialite", "Gatsby", "Hepburn", "Hamptons Charm", "Hampton's Charm",
         "Vegas High Roller", "Country Club",
-    ],
-    "Work & Hustle": [
+    ),
+    "Work & Hustle": (
         "Prime Mover", "Upstart", "Power Broker", "The Boss", "Boss", "Disruptor", "Maverick", "Matador",
         "Gordon Gekko", "Gordon Gecko", "Trader", "Entrepreneur", "Builder",
-    ],
-    "Creative & Arts": [
+    ),
+    "Creative & Arts": (
         "Collector", "Design Maven", "Culture Connoisseur", "Julia", "Madonna", "Architect", "Coachella Mind",
         "Performer", "Reader", "Writer",
-    ],
-    "Music & Nightlife": [
+    ),
+    "Music & Nightlife": (
         "Rhythm Nation", "Night Owl", "Social Butterfly", "ATL", "Jenny from the Block", "Nashville Dream",
         "Beyoncé", "Bourbon Streeter", "Beats", "Swiftie", "Kendrick", "Motown Love", "Red Rockin'", "Red Rocking",
         "Soundcheck", "Block Party", "Yo! MTV", "Rap Caviar", "EDM Afterlife", "Country Mile", "Vinyl", "Backstage Pass",
         "Festivalgoer", "Motowner",
-    ],
-    "Travel & Exploration": [
+    ),
+    "Travel & Exploration": (
         "Romantic Voyager", "Retreat Seeker", "Island Hopper", "Backpacker", "Digital Nomad", "Road Trip",
         "Bond Tripper", "Weekend Warrior", "Yellowstoner", "Beach Bum", "Pre Checker", "PreChecker", "Rest Stop",
-    ],
-    "Tech & Innovation": [
+    ),
+    "Tech & Innovation": (
         "Techie", "Visionary", "Palo Alto", "Crypto Bro", "Renovator", "Digital Nomad", "Ribeye", "Innovator",
-    ],
-    "Family & Caregiving": [
+    ),
+    "Family & Caregiving": (
         "Single Parent", "New Parent", "Caregiver", "Empty Nester", "Legacy", "Retiree", "Host", "Split Family",
-    ],
-    "Community & Local Pride": [
+    ),
+    "Community & Local Pride": (
         "Southern Hospitality", "Boston Strong", "Detroit Grit", "Chicago Summer", "Austin Unplugged",
         "Rocky Mountain High", "Cultural Harmonist", "Social Architect", "Main Street", "Neighborhood Watch",
         "Hometown Hero", "Volunteer",
-    ],
-    "Pop Culture & Media Junkies": [
+    ),
+    "Pop Culture & Media Junkies": (
         "Binge Watcher", "Influencer", "Creator", "Timothée", "Timothee", "Seinfeld", "Tarantino", "Cultural Enthusiast",
-    ],
-    "Automotive & Car Culture": [
+    ),
+    "Automotive & Car Culture": (
         "Revved", "Fast Lane", "Modern Tradesman",
-    ],
-    "Civic & Politics": [
+    ),
+    "Civic & Politics": (
         "Potomac Power", "Oprah", "Mayor", "The Mayor", "PTA",
-    ],
-    "Education & Growth": [
+    ),
+    "Education & Growth": (
         "Coach", "Planner", "Self Love", "Fixer", "The Fixer", "Mentor", "Morning Stroll", "Scholar", "Luke",
-    ],
-    "Shopper Mindset": [
+    ),
+    "Shopper Mindset": (
         "Savvy Shopper", "Gifter", "Impulse Buyer", "Bargain Hunter", "Point Warrior", "Budget Minded", "Budget-Minded", "Gift Wrap",
-    ],
-    "Spiritual & Philosophical": [
+    ),
+    "Spiritual & Philosophical": (
         "Old Soul", "Alchemist", "The Alchemist", "Green Pioneer", "Hemingway", "Malibu Nomad", "Golden Age", "Sinatra",
         "Believer", "Pilgrim", "Modern Monk", "Sanctuary", "Faith", "Free Thinker", "Journey",
-    ],
-    "Outdoors & Nature": [
+    ),
+    "Outdoors & Nature": (
         "Hiker", "Campfire", "Tiger", "Country Club", "Morning Stroll", "Trailblazer", "Off The Grid", "Off the Grid", "Stargazer", "Reel Life", "Nature Lover",
-    ],
-    "Pets & Companionship": [
+    ),
+    "Pets & Companionship": (
         "Dog Parent", "Cat Person", "Rescuer", "Pack Leader", "Petfluencer", "Pawrent", "Best in Show", "Lulu",
-    ],
-    "Moments & Holidays": [
+    ),
+    "Moments & Holidays": (
         "Holiday Table", "Cheers", "Big Date", "Night In", "Game Day", "Payday", "Sunday Reset", "First Date",
         "Late Checkout", "Morning Commute", "After Hours", "Family Table", "Holiday Hang", "Pizza Night",
-    ],
+    ),
 }
 
 # Build reverse lookup: persona name → phylum
-PERSONA_TO_PHYLUM: Dict[str, str] = {}
+PERSONA_TO_PHYLUM: Dict[str, str] = {
+    persona: phylum for phylum, personas in PHYLUM_PERSONA_MAP.items() for persona in personas
+}
+
+# Personas listed under more than one phylum keep every phylum here
+_persona_phyla: Dict[str, Set[str]] = {}
 for _phylum, _personas in PHYLUM_PERSONA_MAP.items():
     for _persona in _personas:
-        PERSONA_TO_PHYLUM[_persona] = _phylum
+        _persona_phyla.setdefault(_persona, set()).add(_phylum)
+PERSONA_TO_PHYLA: Dict[str, FrozenSet[str]] = {
+    persona: frozenset(phyla) for persona, phyla in _persona_phyla.items()
+}
+del _persona_phyla
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -667,7 +723,7 @@ AD_CATEGORY_ANCHORS: Dict[str, List[str]] = {
 }
 
 # All 15 anchor names for reference (14 original + B2B)
-ALL_ANCHORS: List[str] = [
+ALL_ANCHORS: Tuple[str, ...] = (
     "RJM Auto",
     "RJM QSR",
     "RJM Culinary & Dining",
@@ -683,7 +739,7 @@ ALL_ANCHORS: List[str] = [
     "RJM Spirits & Alcohol",
     "RJM Sports & Fitness",
     "RJM B2B & Professional Services",
-]
+)
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -697,7 +753,7 @@ ALL_ANCHORS: List[str] = [
 # Every persona program includes four generational anchors — one for each cohort.
 # ────────────────────────────────────────────────────────────────────────────
 
-GENERATIONS: Dict[str, Dict[str, str]] = {
+GENERATIONS: Dict[str, str] = {
     # GEN Z (8)
     "Gen Z–Cloud Life": "Curated for a generation that embodies life lived online — where platforms, streams, and feeds aren't tools but the atmosphere itself.",
     "Gen Z–Fast Culture": "Curated for a generation that embodies the churn of trends — aesthetics, food, and lifestyles flipped fast, adopted and discarded at warp speed.",
@@ -736,37 +792,34 @@ GENERATIONS: Dict[str, Dict[str, str]] = {
     "Boomer–Universal Soundtrack": "Curated for a generation united by shared music and culture — the soundtrack of collective living.",
 }
 
-# Grouped by cohort for selection logic
-GENERATIONS_BY_COHORT: Dict[str, List[str]] = {
-    "Gen Z": [
-        "Gen Z–Cloud Life", "Gen Z–Fast Culture", "Gen Z–Main Character Energy", "Gen Z–SelfTok",
-        "Gen Z–Gossip", "Gen Z–Alt Hustle", "Gen Z–Cause Identity", "Gen Z–Prompted",
-    ],
-    "Millennial": [
-        "Millennial–Aware", "Millennial–Foodstagram", "Millennial–Growth-Minded", "Millennial–Spin Juice",
-        "Millennial–Startup Nation", "Millennial–Throwback", "Millennial–Wanderlust", "Millennial–Vibing",
-    ],
-    "Gen X": [
-        "Gen X–\"Brand\" New World", "Gen X–Crossfaded", "Gen X–Free World", "Gen X–Isn't It Ironic?",
-        "Gen X–Latchkey Life", "Gen X–Mixtape Society", "Gen X–Pop Language", "Gen X–Teen Spirit",
-    ],
-    "Boomer": [
-        "Boomer–Ambition Age", "Boomer–Camelot", "Boomer–Counterculture", "Boomer–The Living Room",
-        "Boomer–Marching Forward", "Boomer–Shifting Roles", "Boomer–Suburbia", "Boomer–Universal Soundtrack",
-    ],
+# Grouped by cohort for selection logic, derived from the "<Cohort>–<Segment>" names
+# so the grouping cannot drift from GENERATIONS (cohort and segment order are preserved)
+_segments_by_cohort: Dict[str, List[str]] = {}
+for _segment in GENERATIONS:
+    _segments_by_cohort.setdefault(_segment.partition("–")[0], []).append(_segment)
+GENERATIONS_BY_COHORT: Dict[str, Tuple[str, ...]] = {
+    cohort: tuple(segments) for cohort, segments in _segments_by_cohort.items()
 }
+del _segments_by_cohort
+
+ALL_GENERATIONAL_NAMES: FrozenSet[str] = frozenset(GENERATIONS)
+
+# En dash, hyphen and em dash all become spaces in one translate pass
+_GENERATIONAL_DASH_TABLE = str.maketrans({"–": " ", "-": " ", "—": " "})
+
+
+def _normalize_generational_key(name: str) -> str:
+    """Normalize: "Gen Z–Prompted" -> "gen z prompted", "Gen-Z Prompted" -> "gen z prompted"."""
+    return " ".join(name.lower().translate(_GENERATIONAL_DASH_TABLE).split())
 
-ALL_GENERATIONAL_NAMES: Set[str] = set(GENERATIONS.keys())
 
 # Build normalized generational name map for fuzzy matching
-_NORMALIZED_GENERATIONAL_MAP: Dict[str, str] = {}
-for _gen_name in ALL_GENERATIONAL_NAMES:
-    # Normalize: "Gen Z–Prompted" -> "gen z prompted", "Gen-Z Prompted" -> "gen z prompted"
-    _normalized = _gen_name.lower().replace("–", " ").replace("-", " ").replace("—", " ")
-    _normalized = " ".join(_normalized.split())  # collapse whitespace
-    _NORMALIZED_GENERATIONAL_MAP[_normalized] = _gen_name
+_NORMALIZED_GENERATIONAL_MAP: Dict[str, str] = {
+    _normalize_generational_key(gen_name): gen_name for gen_name in ALL_GENERATIONAL_NAMES
+}
 
 
+@lru_cache(maxsize=2048)
 def normalize_generational_name(name: str) -> Optional[str]:
     """Normalize a generational segment name to its canonical form.
     
@@ -774,6 +827,8 @@ def normalize_generational_name(name: str) -> Optional[str]:
     - "Gen-Z Prompted" -> "Gen Z–Prompted"
     - "Gen Z - Prompted" -> "Gen Z–Prompted"
     - "Millennial-Growth-Minded" -> "Millennial–Growth-Minded"
+    
+    Memoized: the function is pure and LLM output repeats a small set of spellings.
     """
     if not name:
         return None
@@ -781,9 +836,7 @@ def normalize_generational_name(name: str) -> Optional[str]:
     if name in ALL_GENERATIONAL_NAMES:
         return name
     # Normalize and lookup
-    normalized = name.lower().replace("–", " ").replace("-", " ").replace("—", " ")
-    normalized = " ".join(normalized.split())
-    return _NORMALIZED_GENERATIONAL_MAP.get(normalized)
+    return _NORMALIZED_GENERATIONAL_MAP.get(_normalize_generational_key(name))
 
 
 # ────────────────────────────────────────────────────────────────────────────
@@ -831,13 +884,13 @@ MULTICULTURAL_EXPRESSIONS: Dict[str, Dict[str, str]] = {
     "New Americana": "Curated for those who define modern U.S. identity — where blended heritage, global influences, and new traditions form a cultural future.",
 }
 
-MULTICULTURAL_BY_LINEAGE: Dict[str, List[str]] = {
-    "Black American": ["Everyday Joy", "Faith & Fellowship", "Cultural Tastemakers", "HBCU Pride", "Afrofuturism & Innovation"],
-    "Latino / Hispanic": ["First-Gen Hustle", "Familia Forward", "Ritmo & Roots", "Barrio Creators", "Faith · Fútbol · Flavor"],
-    "AAPI": ["K-Wave", "Diaspora Foodies", "Generational Bridge", "STEM & Startups", "Heritage Creators"],
-    "South Asian / Desi": ["Bollywood to B-School", "Faith & Family (Desi)", "Desi Creators", "Second-Gen Synth", "Spice Route Entrepreneurs"],
-    "MENA": ["Heritage & Hospitality", "Faith & Modernity", "Diaspora Innovators", "Art & Architecture", "Next-Gen Creators"],
-    "Hybrid / Global": ["Culture Collide", "Fusion Foodies", "Hybrid Households", "Global Millennial", "New Americana"],
+MULTICULTURAL_BY_LINEAGE: Dict[str, Tuple[str, ...]] = {
+    "Black American": ("Everyday Joy", "Faith & Fellowship", "Cultural Tastemakers", "HBCU Pride", "Afrofuturism & Innovation"),
+    "Latino / Hispanic": ("First-Gen Hustle", "Familia Forward", "Ritmo & Roots", "Barrio Creators", "Faith · Fútbol · Flavor"),
+    "AAPI": ("K-Wave", "Diaspora Foodies", "Generational Bridge", "STEM & Startups", "Heritage Creators"),
+    "South Asian / Desi": ("Bollywood to B-School", "Faith & Family (Desi)", "Desi Creators", "Second-Gen Synth", "Spice Route Entrepreneurs"),
+    "MENA": ("Heritage & Hospitality", "Faith & Modernity", "Diaspora Innovators", "Art & Architecture", "Next-Gen Creators"),
+    "Hybrid / Global": ("Culture Collide", "Fusion Foodies", "Hybrid Households", "Global Millennial", "New Americana"),
 }
 
 
@@ -849,7 +902,7 @@ MULTICULTURAL_BY_LINEAGE: Dict[str, List[str]] = {
 # ────────────────────────────────────────────────────────────────────────────
 
 # List of DMA Segments (125) - exact from RJM INGREDIENT CANON 11.26.25
-LOCAL_CULTURE_DMAS: List[str] = [
+LOCAL_CULTURE_DMAS: Tuple[str, ...] = (
     "Albany-NY Culture", "Albuquerque-Santa Fe Culture", "Alaska Culture", "Ann Arbor Culture",
     "Atlanta Culture", "Austin Culture", "Baton Rouge Culture", "Birmingham Culture", "Boise Culture",
     "Boston Culture", "Bozeman Culture", "Bucks County Culture", "Buffalo Culture", "Cape Cod Culture",
@@ -877,10 +930,10 @@ LOCAL_CULTURE_DMAS: List[str] = [
     "Tulsa Culture", "Upper Peninsula Culture", "Vail-Aspen Culture", "Vermont Culture", "Waco Culture",
     "Washington-DC Culture", "West Palm Culture", "West Texas Culture", "West Virginia Culture",
     "Westchester County Culture", "Wichita Culture", "Wyoming Culture",
-]
+)
 
 # Quick lookup set for validation
-LOCAL_CULTURE_SET: Set[str] = set(LOCAL_CULTURE_DMAS)
+LOCAL_CULTURE_SET: FrozenSet[str] = frozenset(LOCAL_CULTURE_DMAS)
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -933,26 +986,33 @@ CATEGORY_KEYWORDS: Dict[str, Sequence[str]] = {
 }
 
 # Brands that span multiple categories (dual anchors)
-DUAL_ANCHOR_BRANDS: Dict[str, List[str]] = {
-    "l'oréal": ["CPG", "Luxury & Fashion"],
-    "loreal": ["CPG", "Luxury & Fashion"],
-    "l'oreal": ["CPG", "Luxury & Fashion"],
-    "estee lauder": ["CPG", "Luxury & Fashion"],
-    "estée lauder": ["CPG", "Luxury & Fashion"],
-    "nike": ["Sports & Fitness", "Retail & E-Commerce"],
-    "adidas": ["Sports & Fitness", "Retail & E-Commerce"],
-    "apple": ["Tech & Wireless", "Luxury & Fashion"],
-    "samsung": ["Tech & Wireless", "Retail & E-Commerce"],
-    "amazon": ["Retail & E-Commerce", "Tech & Wireless"],
-    "uber": ["Tech & Wireless", "Travel & Hospitality"],
-    "lyft": ["Tech & Wireless", "Travel & Hospitality"],
-    "airbnb": ["Travel & Hospitality", "Tech & Wireless"],
-    "disney": ["Entertainment", "Travel & Hospitality"],
-    "marriott": ["Travel & Hospitality", "Luxury & Fashion"],
-    "hilton": ["Travel & Hospitality", "Luxury & Fashion"],
+DUAL_ANCHOR_BRANDS: Dict[str, Tuple[str, ...]] = {
+    "l'oréal": ("CPG", "Luxury & Fashion"),
+    "loreal": ("CPG", "Luxury & Fashion"),
+    "l'oreal": ("CPG", "Luxury & Fashion"),
+    "estee lauder": ("CPG", "Luxury & Fashion"),
+    "estée lauder": ("CPG", "Luxury & Fashion"),
+    "nike": ("Sports & Fitness", "Retail & E-Commerce"),
+    "adidas": ("Sports & Fitness", "Retail & E-Commerce"),
+    "apple": ("Tech & Wireless", "Luxury & Fashion"),
+    "samsung": ("Tech & Wireless", "Retail & E-Commerce"),
+    "amazon": ("Retail & E-Commerce", "Tech & Wireless"),
+    "uber": ("Tech & Wireless", "Travel & Hospitality"),
+    "lyft": ("Tech & Wireless", "Travel & Hospitality"),
+    "airbnb": ("Travel & Hospitality", "Tech & Wireless"),
+    "disney": ("Entertainment", "Travel & Hospitality"),
+    "marriott": ("Travel & Hospitality", "Luxury & Fashion"),
+    "hilton": ("Travel & Hospitality", "Luxury & Fashion"),
 }
 
 
+# (keyword, category) pairs in CATEGORY_KEYWORDS order, so the first hit is the first matching category
+_FLAT_KEYWORDS: Tuple[Tuple[str, str], ...] = tuple(
+    (keyword, category) for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords
+)
+
+
+@lru_cache(maxsize=4096)
 def infer_category(text: str) -> str:
     """Infer primary advertising category using keyword heuristics.
     
@@ -961,42 +1021,15 @@ def infer_category(text: str) -> str:
     for production category detection.
     """
     lowered = text.lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(keyword in lowered for keyword in keywords):
+    for keyword, category in _FLAT_KEYWORDS:
+        if keyword in lowered:
             return category
     return "CPG"  # Default fallback
 
 
-def infer_category_with_llm(brand_name: str, brief: str) -> str:
-    """
-    Use LLM to accurately detect the advertising category for a brand.
-    
-    This is the PRIMARY method for category detection. The LLM understands
-    brand context and can correctly identify categories for well-known brands
-    like Starbucks (Culinary & Dining), Fendi (Luxury & Fashion), 
-    Verizon (Tech & Wireless), etc.
-    
-    PHASE 1 FIX #5: Uses BRAND_CATEGORY_OVERRIDES first for known edge cases
-    like Whole Foods (Retail), Dunkin' (QSR), etc.
-    
-    Args:
-        brand_name: The brand name (e.g., "Starbucks", "Fendi", "Verizon")
-        brief: The campaign brief or context
-        
-    Returns:
-        One of the 15 canonical RJM advertising categories
-    """
-    from app.config.settings import settings
-    from app.services.rjm_vector_store import get_openai_client
-    
-    # NOTE: Overrides disabled to allow LLM to decide category freely
-    
-    # Get the canonical category list
-    valid_categories = list(CATEGORY_PERSONA_MAP.keys())
-    categories_list = "\n".join(f"- {cat}" for cat in valid_categories)
-    
-    # Build the LLM prompt with comprehensive edge case guidance
-    system_prompt = f"""You are an advertising category classifier for RJM. Your job is to determine the correct advertising category for a brand based on its PRIMARY business model and the campaign brief.
+def _build_category_system_prompt(categories_list: str, response_instruction: str) -> str:
+    """Build the category classifier system prompt with its edge case guidance."""
+    return f"""You are an advertising category classifier for RJM. Your job is to determine the correct advertising category for a brand based on its PRIMARY business model and the campaign brief.
 
 VALID CATEGORIES (choose exactly one):
 {categories_list}
@@ -1050,81 +1083,211 @@ OTHER GUIDANCE:
 - Alcohol & Spirits: Beer, wine, spirits brands
 - CPG: Consumer packaged goods, grocery items, household products (Tide, Clorox, Kraft)
 
-RESPOND WITH ONLY THE CATEGORY NAME, nothing else."""
+{response_instruction}"""
+
+
+# Classifier prompts depend only on the static category list, so build them once
+_CATEGORIES_LIST = "\n".join(f"- {cat}" for cat in CATEGORY_PERSONA_MAP)
+_CATEGORY_SYSTEM_PROMPT = _build_category_system_prompt(
+    _CATEGORIES_LIST, "RESPOND WITH ONLY THE CATEGORY NAME, nothing else."
+)
+_BATCH_CATEGORY_SYSTEM_PROMPT = _build_category_system_prompt(
+    _CATEGORIES_LIST,
+    "RESPOND WITH A JSON OBJECT mapping each item number to its category name, "
+    'e.g. {"1": "QSR", "2": "CPG"}, nothing else.',
+)
+
+
+# Lowercased category name -> canonical name, in CATEGORY_PERSONA_MAP order
+_CATEGORY_BY_LOWER: Dict[str, str] = {category.lower(): category for category in CATEGORY_PERSONA_MAP}
 
+
+def _match_category(response: str) -> Optional[str]:
+    """Map an LLM category answer onto a canonical category, or None."""
+    response_lower = response.strip().lower()
+    exact = _CATEGORY_BY_LOWER.get(response_lower)
+    if exact is not None:
+        return exact
+    for category_lower, category in _CATEGORY_BY_LOWER.items():
+        if category_lower in response_lower:
+            return category
+    return None
+
+
+class _UnexpectedCategoryError(ValueError):
+    """The LLM answered with something that is not a canonical category."""
+
+
+@lru_cache(maxsize=1024)
+def _detect_category_with_llm(brand_name: str, brief: str) -> str:
+    """
+    Ask the LLM for the category of a (brand, brief) pair.
+    
+    Returns the validated category. Results are memoized since temperature=0
+    makes the call deterministic. API errors and unexpected answers raise
+    (_UnexpectedCategoryError for the latter), so they are never cached and
+    the pair is retried on the next call.
+    """
+    from app.services.rjm_vector_store import get_openai_client
+    
+    # NOTE: Overrides disabled to allow LLM to decide category freely
+    
     user_prompt = f"""Brand: {brand_name}
 Brief: {brief}
 
 What is the correct advertising category for this brand?"""
 
+    client = get_openai_client()
+    completion = client.chat.completions.create(
+        model=settings.effective_classification_model,
+        temperature=0,  # Deterministic for consistency
+        seed=0,
+        max_tokens=50,
+        messages=[
+            {"role": "system", "content": _CATEGORY_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+    )
+    
+    response = completion.choices[0].message.content.strip()
+    
+    # Validate the response is a valid category
+    category = _match_category(response)
+    if category is not None:
+        app_logger.info(f"LLM category detection: '{brand_name}' -> '{category}'")
+        return category
+    
+    raise _UnexpectedCategoryError(response)
+
+
+def infer_category_with_llm(brand_name: str, brief: str) -> str:
+    """
+    Use LLM to accurately detect the advertising category for a brand.
+    
+    This is the PRIMARY method for category detection. The LLM understands
+    brand context and can correctly identify categories for well-known brands
+    like Starbucks (Culinary & Dining), Fendi (Luxury & Fashion), 
+    Verizon (Tech & Wireless), etc.
+    
+    PHASE 1 FIX #5: Uses BRAND_CATEGORY_OVERRIDES first for known edge cases
+    like Whole Foods (Retail), Dunkin' (QSR), etc.
+    
+    Args:
+        brand_name: The brand name (e.g., "Starbucks", "Fendi", "Verizon")
+        brief: The campaign brief or context
+        
+    Returns:
+        One of the 15 canonical RJM advertising categories
+    """
+    try:
+        # Whitespace-only differences share one cache entry (and one LLM call)
+        return _detect_category_with_llm(" ".join(brand_name.split()), " ".join(brief.split()))
+    except _UnexpectedCategoryError as exc:
+        app_logger.warning(f"LLM returned unexpected category '{exc}' for brand '{brand_name}', falling back to keyword detection")
+    except Exception as exc:
+        app_logger.error(f"LLM category detection failed for '{brand_name}': {exc}")
+    
+    # Fallback to keyword-based detection
+    return infer_category(f"{brand_name} {brief}")
+
+
+def infer_categories_with_llm(pairs: Sequence[Tuple[str, str]]) -> List[str]:
+    """
+    Detect advertising categories for several (brand_name, brief) pairs in one LLM call.
+    
+    Duplicate pairs (including whitespace-only variants) are sent once. Rows the LLM omits or answers with an unknown
+    category fall back to keyword detection, as does the whole batch on API errors.
+    
+    Returns:
+        One canonical category per input pair, in input order
+    """
+    from app.services.rjm_vector_store import get_openai_client
+    
+    # Whitespace-only differences share one prompt row, as in infer_category_with_llm
+    normalized = [(" ".join(brand_name.split()), " ".join(brief.split())) for brand_name, brief in pairs]
+    unique_pairs = list(dict.fromkeys(normalized))
+    if not unique_pairs:
+        return []
+    
+    items = "\n".join(
+        f"{index}. Brand: {brand_name}\n   Brief: {brief}"
+        for index, (brand_name, brief) in enumerate(unique_pairs, start=1)
+    )
+    user_prompt = f"""Classify each of the following brands:
+{items}"""
+    
+    answers: Dict[str, Any] = {}
     try:
         client = get_openai_client()
         completion = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+            model=settings.effective_classification_model,
             temperature=0,  # Deterministic for consistency
-            max_tokens=50,
+            seed=0,
+            response_format={"type": "json_object"},
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": _BATCH_CATEGORY_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
         )
-        
-        response = completion.choices[0].message.content.strip()
-        
-        # Validate the response is a valid category
-        for category in valid_categories:
-            if category.lower() == response.lower() or category.lower() in response.lower():
-                app_logger.info(f"LLM category detection: '{brand_name}' -> '{category}'")
-                return category
-        
-        # If no exact match, try to find the best match
-        response_lower = response.lower()
-        for category in valid_categories:
-            # Check if category name appears in response
-            cat_lower = category.lower()
-            if cat_lower in response_lower:
-                app_logger.info(f"LLM category detection (partial match): '{brand_name}' -> '{category}'")
-                return category
-        
-        # Fallback to keyword-based if LLM response is unexpected
-        app_logger.warning(f"LLM returned unexpected category '{response}' for brand '{brand_name}', falling back to keyword detection")
-        return infer_category(f"{brand_name} {brief}")
-        
+        parsed = json.loads(completion.choices[0].message.content)
+        if isinstance(parsed, dict):
+            answers = parsed
     except Exception as exc:
-        app_logger.error(f"LLM category detection failed for '{brand_name}': {exc}")
-        # Fallback to keyword-based detection
-        return infer_category(f"{brand_name} {brief}")
+        app_logger.error(f"Batch LLM category detection failed for {len(unique_pairs)} brands: {exc}")
+    
+    resolved: Dict[Tuple[str, str], str] = {}
+    for index, (brand_name, brief) in enumerate(unique_pairs, start=1):
+        answer = answers.get(str(index))
+        category = _match_category(answer) if isinstance(answer, str) else None
+        if category is None:
+            # Fallback to keyword-based detection for this row
+            category = infer_category(f"{brand_name} {brief}")
+        resolved[(brand_name, brief)] = category
+    
+    return [resolved[pair] for pair in normalized]
 
 
-def get_brand_categories(brand_name: str) -> List[str]:
-    """Return list of categories for a brand (handles dual-anchor brands)."""
-    lowered = brand_name.lower().strip()
-    if lowered in DUAL_ANCHOR_BRANDS:
-        return DUAL_ANCHOR_BRANDS[lowered]
-    return []
+def get_brand_categories(brand_name: str) -> Tuple[str, ...]:
+    """Return the categories for a brand (handles dual-anchor brands)."""
+    return DUAL_ANCHOR_BRANDS.get(brand_name.lower().strip(), ())
 
 
-def analyze_brand_context(brand_name: str, brief: str, category: str) -> Dict[str, Any]:
-    """
-    Use LLM to deeply understand the brand context BEFORE persona selection.
-    
-    This is the KEY FIX for the "sequencing problem" Jesse identified:
-    - The system was deciding WHO the audience is before understanding WHAT the product/service is
-    - Now we understand the brand FIRST, then let persona selection follow the meaning
-    
-    This replaces all hardcoded heuristics (detect_meaning_tags, get_flexible_persona_pool prepending)
-    with intelligent LLM-based brand understanding.
-    
-    Returns a dict with:
-    - audience_type: "consumer" | "b2b" | "civic" | "mixed"
-    - persona_guidance: LLM-generated guidance for persona selection
-    - avoid_personas: List of persona types to avoid
-    - prioritize_personas: List of persona types to prioritize
-    """
-    from app.config.settings import settings
-    from app.services.rjm_vector_store import get_openai_client
-    
-    system_prompt = """You are an expert brand strategist analyzing a brand to guide persona selection.
+# Successful brand-context analyses, LRU-evicted and expired after an hour
+_BRAND_CONTEXT_CACHE: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+_BRAND_CONTEXT_CACHE_TTL = 3600.0
+_BRAND_CONTEXT_CACHE_MAX = 512
+_BRAND_CONTEXT_CACHE_LOCK = threading.Lock()
+
+
+def _brand_context_cache_key(brand_name: str, brief: str, category: str) -> str:
+    """Fixed-size cache key; case and whitespace differences map to the same entry."""
+    raw = f"{brand_name.lower().strip()}|{category}|{' '.join(brief.split())}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_brand_context(key: str) -> Optional[Dict[str, Any]]:
+    with _BRAND_CONTEXT_CACHE_LOCK:
+        entry = _BRAND_CONTEXT_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= _BRAND_CONTEXT_CACHE_TTL:
+            del _BRAND_CONTEXT_CACHE[key]
+            return None
+        _BRAND_CONTEXT_CACHE.move_to_end(key)
+    return copy.deepcopy(result)
+
+
+def _store_brand_context(key: str, result: Dict[str, Any]) -> None:
+    with _BRAND_CONTEXT_CACHE_LOCK:
+        _BRAND_CONTEXT_CACHE[key] = (time.monotonic(), copy.deepcopy(result))
+        _BRAND_CONTEXT_CACHE.move_to_end(key)
+        while len(_BRAND_CONTEXT_CACHE) > _BRAND_CONTEXT_CACHE_MAX:
+            _BRAND_CONTEXT_CACHE.popitem(last=False)
+
+
+# Static system prompt, kept as one constant so every request shares an identical prefix
+_BRAND_CONTEXT_SYSTEM_PROMPT = """You are an expert brand strategist analyzing a brand to guide persona selection.
 Your job is to understand WHAT the brand/service actually is and WHO the real audience is.
 
 CRITICAL CLASSIFICATION RULES:
@@ -1170,6 +1333,31 @@ Respond in JSON format:
   "avoid_personas": ["specific persona names to avoid"]
 }"""
 
+
+def analyze_brand_context(brand_name: str, brief: str, category: str) -> Dict[str, Any]:
+    """
+    Use LLM to deeply understand the brand context BEFORE persona selection.
+    
+    This is the KEY FIX for the "sequencing problem" Jesse identified:
+    - The system was deciding WHO the audience is before understanding WHAT the product/service is
+    - Now we understand the brand FIRST, then let persona selection follow the meaning
+    
+    This replaces all hardcoded heuristics (detect_meaning_tags, get_flexible_persona_pool prepending)
+    with intelligent LLM-based brand understanding.
+    
+    Returns a dict with:
+    - audience_type: "consumer" | "b2b" | "civic" | "mixed"
+    - persona_guidance: LLM-generated guidance for persona selection
+    - avoid_personas: List of persona types to avoid
+    - prioritize_personas: List of persona types to prioritize
+    """
+    from app.services.rjm_vector_store import get_openai_client
+    
+    cache_key = _brand_context_cache_key(brand_name, brief, category)
+    cached = _get_cached_brand_context(cache_key)
+    if cached is not None:
+        return cached
+    
     user_prompt = f"""Brand: {brand_name}
 Category: {category}
 Brief: {brief}
@@ -1179,31 +1367,24 @@ Analyze this brand and provide persona selection guidance."""
     try:
         client = get_openai_client()
         completion = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+            model=settings.effective_classification_model,
             temperature=0.1,  # Low temperature for consistency
-            max_tokens=500,
+            max_tokens=250,  # Expected JSON payload is well under 200 tokens
+            response_format={"type": "json_object"},
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": _BRAND_CONTEXT_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
         )
         
-        response = completion.choices[0].message.content.strip()
-        
-        # Parse JSON response
-        import json
-        # Handle potential markdown code blocks
-        if response.startswith("```"):
-            response = response.split("```")[1]
-            if response.startswith("json"):
-                response = response[4:]
-        
-        result = json.loads(response)
+        # JSON mode guarantees a bare JSON object, no markdown fences to strip
+        result = json.loads(completion.choices[0].message.content)
         app_logger.info(
             f"Brand context analysis for '{brand_name}': "
             f"audience_type={result.get('audience_type')}, "
             f"prioritize={result.get('prioritize_personas', [])[:3]}"
         )
+        _store_brand_context(cache_key, result)
         return result
         
     except Exception as exc:
@@ -1218,6 +1399,40 @@ Analyze this brand and provide persona selection guidance."""
         }
 
 
+def analyze_brand_contexts(
+    items: Sequence[Tuple[str, str, str]],
+    max_concurrency: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Run analyze_brand_context for several (brand_name, brief, category) items concurrently.
+    
+    Duplicate items (same cache key) are analyzed once, and at most max_concurrency
+    requests are in flight at a time. Failed analyses fall back to the neutral
+    guidance exactly as the single-item call does.
+    
+    Returns:
+        One analysis dict per input item, in input order
+    """
+    unique_items: Dict[str, Tuple[str, str, str]] = {}
+    for brand_name, brief, category in items:
+        unique_items.setdefault(_brand_context_cache_key(brand_name, brief, category), (brand_name, brief, category))
+    if not unique_items:
+        return []
+    
+    workers = max(1, min(max_concurrency, len(unique_items)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        analyses = dict(zip(
+            unique_items,
+            executor.map(lambda item: analyze_brand_context(*item), unique_items.values()),
+        ))
+    
+    # Copy per row so duplicate items never share a mutable result
+    return [
+        copy.deepcopy(analyses[_brand_context_cache_key(brand_name, brief, category)])
+        for brand_name, brief, category in items
+    ]
+
+
 def detect_meaning_tags(brand_name: str, brief: str) -> Set[str]:
     """
     DEPRECATED: This function has been disabled to prevent hardcoded heuristics
@@ -1251,28 +1466,26 @@ def get_flexible_persona_pool(category: str, brand_name: str, brief: str) -> Lis
     MEANING expressed in the brief and write-ups, guided by prompts, not heuristics.
     """
     # Start with pure category pool
-    base_pool = list(CATEGORY_PERSONA_MAP.get(category, []))
+    base_pool = list(CATEGORY_PERSONA_MAP.get(category, ()))
     
     # Dual-anchor: union both category pools (for known dual-category brands like Uber)
-    dual_categories = DUAL_ANCHOR_BRANDS.get(brand_name.lower().strip(), [])
+    dual_categories = get_brand_categories(brand_name)
     for dual_cat in dual_categories:
         if dual_cat != category:
-            base_pool.extend(CATEGORY_PERSONA_MAP.get(dual_cat, []))
+            base_pool.extend(CATEGORY_PERSONA_MAP.get(dual_cat, ()))
     
     # Deduplicate while preserving order
-    seen: Set[str] = set()
-    deduped: List[str] = []
-    for name in base_pool:
-        if name not in seen:
-            seen.add(name)
-            deduped.append(name)
-    
-    return deduped
+    return list(dict.fromkeys(base_pool))
 
 
-def get_category_personas(category: str) -> List[str]:
+def get_category_personas(category: str) -> Tuple[str, ...]:
     """Return persona names for a given advertising category."""
-    return CATEGORY_PERSONA_MAP.get(category, [])
+    return CATEGORY_PERSONA_MAP.get(category, ())
+
+
+def get_persona_categories(persona_name: str) -> FrozenSet[str]:
+    """Return the advertising categories whose persona list includes this persona."""
+    return PERSONA_TO_CATEGORIES.get(persona_name, _EMPTY_FROZENSET)
 
 
 def is_persona_valid_for_category(persona_name: str, category: str) -> bool:
@@ -1296,21 +1509,15 @@ def is_persona_valid_for_category(persona_name: str, category: str) -> bool:
     if not persona_name or not category:
         return False
 
-    # Get the category's persona pool
-    category_personas = CATEGORY_PERSONA_MAP.get(category, [])
-    if not category_personas:
+    # Get the category's normalized persona pool (built once at import)
+    normalized_category_personas = _NORMALIZED_CATEGORY_PERSONA_SETS.get(category)
+    if not normalized_category_personas:
         # Unknown category - fall back to canon check only
         return is_canon_persona(persona_name)
 
     # Normalize persona name for matching
     canonical_name = get_canonical_name(persona_name)
 
-    # Build normalized set of category personas for matching
-    normalized_category_personas = set()
-    for p in category_personas:
-        normalized_category_personas.add(p.lower())
-        normalized_category_personas.add(_normalize_persona_name(p).lower())
-
     # Check if persona is in category pool
     if canonical_name.lower() in normalized_category_personas:
         return True
@@ -1322,17 +1529,29 @@ def is_persona_valid_for_category(persona_name: str, category: str) -> bool:
     return False
 
 
+def partition_personas_by_category(
+    persona_names: List[str], category: str
+) -> Tuple[List[str], List[str]]:
+    """
+    Split personas into (valid, invalid) lists for a category in a single pass.
+
+    Use this when both lists are needed instead of calling
+    filter_personas_by_category and get_invalid_personas_for_category separately.
+    """
+    valid: List[str] = []
+    invalid: List[str] = []
+    for name in persona_names:
+        (valid if is_persona_valid_for_category(name, category) else invalid).append(name)
+    return valid, invalid
+
+
 def get_invalid_personas_for_category(persona_names: List[str], category: str) -> List[str]:
     """
     Return list of personas that are NOT valid for a given category.
 
     Useful for debugging and logging which personas were rejected.
     """
-    invalid = []
-    for name in persona_names:
-        if not is_persona_valid_for_category(name, category):
-            invalid.append(name)
-    return invalid
+    return partition_personas_by_category(persona_names, category)[1]
 
 
 def filter_personas_by_category(persona_names: List[str], category: str) -> List[str]:
@@ -1341,7 +1560,7 @@ def filter_personas_by_category(persona_names: List[str], category: str) -> List
 
     This is used to enforce the Category → Persona Map as the primary selector.
     """
-    return [name for name in persona_names if is_persona_valid_for_category(name, category)]
+    return partition_personas_by_category(persona_names, category)[0]
 
 
 def get_category_anchors(category: str) -> List[str]:
@@ -1373,17 +1592,33 @@ def get_persona_phylum(persona_name: str) -> Optional[str]:
     return PERSONA_TO_PHYLUM.get(persona_name)
 
 
+# Dashes become spaces; straight/curly apostrophes and double quotes are dropped
+_PERSONA_NAME_TABLE = str.maketrans(
+    {"-": " ", "–": " ", "—": " ", "'": None, "\u2019": None, "\u2018": None, '"': None}
+)
+
+
 def _normalize_persona_name(name: str) -> str:
     """Normalize persona name for matching (handle hyphen/space/quote variations)."""
-    # Replace various dashes and special chars with spaces
-    result = name.replace("-", " ").replace("–", " ").replace("—", " ")
-    # Remove quotes and apostrophes for matching
-    result = result.replace("'", "").replace("'", "").replace('"', "")
-    # Normalize whitespace
-    result = " ".join(result.split())
-    return result.strip()
+    # One translate pass, then normalize whitespace
+    return " ".join(name.translate(_PERSONA_NAME_TABLE).split())
 
 
+# Normalized, lowercased deprecated names so variant spellings are rejected with one lookup
+_DEPRECATED_NORMALIZED: FrozenSet[str] = frozenset(
+    _normalize_persona_name(deprecated).lower() for deprecated in DEPRECATED_PERSONAS
+)
+
+# Lowercased raw and normalized forms of each category pool, for category validation
+_NORMALIZED_CATEGORY_PERSONA_SETS: Dict[str, FrozenSet[str]] = {
+    category: frozenset(
+        form
+        for persona in personas
+        for form in (persona.lower(), _normalize_persona_name(persona).lower())
+    )
+    for category, personas in CATEGORY_PERSONA_MAP.items()
+}
+
 # Build comprehensive set of ALL canon persona names from both category and phylum maps
 _ALL_CANON_PERSONAS: Set[str] = set()
 _NORMALIZED_CANON_MAP: Dict[str, str] = {}  # normalized_lower -> original
@@ -1403,6 +1638,18 @@ for _category_personas in CATEGORY_PERSONA_MAP.values():
         if _normalized not in _NORMALIZED_CANON_MAP:
             _NORMALIZED_CANON_MAP[_normalized] = _name
 
+# Case-only variants ("chef", "GYM OBSESSED") resolve with one dict hit, skipping normalization.
+# Values come from _NORMALIZED_CANON_MAP so results match the normalized lookup exactly.
+_CANON_BY_LOWER: Dict[str, str] = {
+    _name.lower(): _NORMALIZED_CANON_MAP[_normalize_persona_name(_name).lower()]
+    for _name in _ALL_CANON_PERSONAS
+}
+
+
+def _in_canon(name: str, normalized_lower: str) -> bool:
+    """Canon membership only (no deprecated check), given the name's normalized lowercase form."""
+    return name in _ALL_CANON_PERSONAS or normalized_lower in _NORMALIZED_CANON_MAP
+
 
 def is_canon_persona(name: str) -> bool:
     """Check if a persona name is in the canon (handles name variations).
@@ -1418,18 +1665,13 @@ def is_canon_persona(name: str) -> bool:
         app_logger.debug(f"Rejected deprecated persona: {name}")
         return False
     
-    # Also check normalized form against deprecated list
-    normalized = _normalize_persona_name(name)
-    for deprecated in DEPRECATED_PERSONAS:
-        if _normalize_persona_name(deprecated).lower() == normalized.lower():
-            app_logger.debug(f"Rejected deprecated persona (normalized match): {name}")
-            return False
+    # Normalize once; the same form serves the deprecated and canon lookups
+    normalized_lower = _normalize_persona_name(name).lower()
+    if normalized_lower in _DEPRECATED_NORMALIZED:
+        app_logger.debug(f"Rejected deprecated persona (normalized match): {name}")
+        return False
     
-    # Direct match
-    if name in _ALL_CANON_PERSONAS:
-        return True
-    # Try normalized matching
-    return normalized.lower() in _NORMALIZED_CANON_MAP
+    return _in_canon(name, normalized_lower)
 
 
 def get_canonical_name(name: str) -> str:
@@ -1439,6 +1681,10 @@ def get_canonical_name(name: str) -> str:
     # Direct match - return as-is
     if name in _ALL_CANON_PERSONAS:
         return name
+    # Case-insensitive match
+    canonical = _CANON_BY_LOWER.get(name.lower())
+    if canonical is not None:
+        return canonical
     # Try normalized matching
     normalized = _normalize_persona_name(name).lower()
     return _NORMALIZED_CANON_MAP.get(normalized, name)
@@ -1446,7 +1692,7 @@ def get_canonical_name(name: str) -> str:
 
 def get_generational_segment(cohort: str, index: int = 0) -> Optional[str]:
     """Get a generational segment by cohort and index (for rotation)."""
-    cohort_segments = GENERATIONS_BY_COHORT.get(cohort, [])
+    cohort_segments = GENERATIONS_BY_COHORT.get(cohort, ())
     if not cohort_segments:
         return None
     return cohort_segments[index % len(cohort_segments)]
@@ -1457,9 +1703,9 @@ def get_generational_description(segment_name: str) -> Optional[str]:
     return GENERATIONS.get(segment_name)
 
 
-def get_multicultural_expressions(lineage: str) -> List[str]:
+def get_multicultural_expressions(lineage: str) -> Tuple[str, ...]:
     """Get multicultural expression names for a given cultural lineage."""
-    return MULTICULTURAL_BY_LINEAGE.get(lineage, [])
+    return MULTICULTURAL_BY_LINEAGE.get(lineage, ())
 
 
 def get_multicultural_description(expression_name: str) -> Optional[str]:
@@ -1498,23 +1744,19 @@ MAJOR_CITIES = [
 ]
 
 
+# Explicit local keywords (substring match) plus state and city names anchored at a word
+# start; suffixes stay open so demonyms like "New Yorkers" or "Chicagoans" still count
+_LOCAL_BRIEF_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in LOCAL_KEYWORDS)
+    + r"|(?<!\w)(?:"
+    + "|".join(re.escape(place) for place in (*US_STATES, *MAJOR_CITIES))
+    + ")"
+)
+
+
 def is_local_brief(text: str) -> bool:
     """Detect whether a brief references DMA/state/regional targeting."""
-    lowered = text.lower()
-    
-    # Check explicit local keywords
-    if any(keyword in lowered for keyword in LOCAL_KEYWORDS):
-        return True
-    
-    # Check state names
-    if any(state in lowered for state in US_STATES):
-        return True
-    
-    # Check major city names
-    if any(city in lowered for city in MAJOR_CITIES):
-        return True
-    
-    return False
+    return _LOCAL_BRIEF_PATTERN.search(text.lower()) is not None
 
 
 def get_local_culture_segment(dma_hint: str) -> Optional[str]:
@@ -1559,35 +1801,59 @@ def detect_multicultural_lineage(text: str) -> Optional[str]:
 _RECENT_PERSONAS: deque[str] = deque(maxlen=120)
 _RECENT_GENERATIONAL: deque[str] = deque(maxlen=40)
 
+# Parallel sets mirroring the deques above for O(1) membership checks
+_RECENT_PERSONAS_SET: Set[str] = set()
+_RECENT_GENERATIONAL_SET: Set[str] = set()
+
+# Request handlers share this state across threads; writers and deque snapshots hold the lock
+_RECENT_LOCK = threading.Lock()
+
+
+def register_recent(names: Sequence[str], recent: deque[str], recent_set: Set[str]) -> None:
+    """Append unseen, non-empty names to a bounded deque, keeping its mirror set in sync.
+    
+    `recent` must be a deque with maxlen and `recent_set` a set holding exactly its
+    entries; when the deque is full the evicted name is dropped from the set too.
+    Not thread-safe: callers hold the lock that guards both containers.
+    """
+    for name in names:
+        if name and name not in recent_set:
+            if len(recent) == recent.maxlen:
+                # deque(maxlen) drops the oldest entry on append
+                recent_set.discard(recent[0])
+            recent.append(name)
+            recent_set.add(name)
+
 
 def register_personas_for_rotation(names: Sequence[str]) -> None:
     """Record personas that were just used to help rotation logic."""
-    for name in names:
-        if name not in _RECENT_PERSONAS:
-            _RECENT_PERSONAS.append(name)
+    with _RECENT_LOCK:
+        register_recent(names, _RECENT_PERSONAS, _RECENT_PERSONAS_SET)
 
 
 def register_generational_for_rotation(names: Sequence[str]) -> None:
     """Record generational segments that were just used."""
-    for name in names:
-        if name not in _RECENT_GENERATIONAL:
-            _RECENT_GENERATIONAL.append(name)
+    with _RECENT_LOCK:
+        register_recent(names, _RECENT_GENERATIONAL, _RECENT_GENERATIONAL_SET)
 
 
 def is_persona_recent(name: str) -> bool:
     """Check if a persona was recently used."""
-    return name in _RECENT_PERSONAS
+    return name in _RECENT_PERSONAS_SET
 
 
 def is_generational_recent(name: str) -> bool:
     """Check if a generational segment was recently used."""
-    return name in _RECENT_GENERATIONAL
+    return name in _RECENT_GENERATIONAL_SET
 
 
 def clear_rotation_cache() -> None:
     """Clear rotation caches (useful for testing)."""
-    _RECENT_PERSONAS.clear()
-    _RECENT_GENERATIONAL.clear()
+    with _RECENT_LOCK:
+        _RECENT_PERSONAS.clear()
+        _RECENT_GENERATIONAL.clear()
+        _RECENT_PERSONAS_SET.clear()
+        _RECENT_GENERATIONAL_SET.clear()
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -1631,6 +1897,10 @@ def diversify_by_phylum(
     result = list(current)
     seen = set(result)
     
+    # Dominance limit as an integer ratio so the hot loop compares without dividing
+    dominance = Fraction(max_dominance).limit_denominator(1000)
+    dominance_num, dominance_den = dominance.numerator, dominance.denominator
+    
     # Track phylum counts
     phylum_counts: Dict[str, int] = {}
     for name in result:
@@ -1648,12 +1918,13 @@ def diversify_by_phylum(
         if not phylum:
             continue
         
-        # Check if adding this persona would violate dominance
+        # Check if adding this persona would violate dominance:
+        # (current_count + 1) / new_total > max_dominance, cross-multiplied
         current_count = phylum_counts.get(phylum, 0)
-        new_total = len(result) + 1
-        new_dominance = (current_count + 1) / new_total
-        
-        if new_dominance > max_dominance and len(phylum_counts) >= min_phyla:
+        if (
+            len(phylum_counts) >= min_phyla
+            and (current_count + 1) * dominance_den > dominance_num * (len(result) + 1)
+        ):
             # Skip this persona if it would cause over-dominance
             continue
         
@@ -1676,11 +1947,17 @@ def is_deprecated_persona(name: str) -> bool:
     if name in DEPRECATED_PERSONAS:
         return True
     # Also check normalized form
-    normalized = _normalize_persona_name(name).lower()
-    for deprecated in DEPRECATED_PERSONAS:
-        if _normalize_persona_name(deprecated).lower() == normalized:
-            return True
-    return False
+    return _normalize_persona_name(name).lower() in _DEPRECATED_NORMALIZED
+
+
+def any_deprecated(names: Iterable[str]) -> bool:
+    """Check whether any canonical persona name in the batch is deprecated."""
+    return not DEPRECATED_PERSONAS.isdisjoint(names)
+
+
+def filter_active(names: Iterable[str]) -> List[str]:
+    """Drop deprecated canonical persona names, preserving order."""
+    return [name for name in names if name not in DEPRECATED_PERSONAS]
 
 
 def validate_persona_strict(name: str, category: str) -> Tuple[bool, Optional[str]]:
@@ -1699,8 +1976,8 @@ def validate_persona_strict(name: str, category: str) -> Tuple[bool, Optional[st
     if is_deprecated_persona(name):
         return False, f"'{name}' is a deprecated/sunset persona"
     
-    # Check canon
-    if not is_canon_persona(name):
+    # Check canon (deprecated names were already rejected above)
+    if not _in_canon(name, _normalize_persona_name(name).lower()):
         return False, f"'{name}' is not in the RJM canon"
     
     # Check category fit
@@ -1735,6 +2012,15 @@ def select_personas_with_rotation(
     exclude_set = exclude or set()
     candidates = []
     
+    # First position of each recently used persona, built once instead of per candidate
+    recent_positions: Dict[str, int] = {}
+    if prefer_fresh:
+        # Snapshot so a concurrent register cannot mutate the deque mid-iteration
+        with _RECENT_LOCK:
+            recent = tuple(_RECENT_PERSONAS)
+        for position, recent_name in enumerate(recent):
+            recent_positions.setdefault(recent_name, position)
+    
     for name in pool:
         if name in exclude_set:
             continue
@@ -1744,20 +2030,15 @@ def select_personas_with_rotation(
             continue
         
         # Calculate weight
-        recency_pos = -1
-        if prefer_fresh and name in _RECENT_PERSONAS:
-            recency_pos = list(_RECENT_PERSONAS).index(name)
-        
+        recency_pos = recent_positions.get(name, -1)
         weight = get_rotation_weight(name, category, recency_pos)
         candidates.append((name, weight))
     
-    # Sort by weight (highest first) with randomization for equal weights
-    candidates.sort(key=lambda x: (-x[1], random.random()))
-    
-    # Select top candidates
-    selected = [name for name, _ in candidates[:count]]
+    # Top `count` by weight (highest first) with randomization for equal weights;
+    # a bounded heap avoids sorting the whole pool when only a few are needed
+    top = heapq.nsmallest(count, candidates, key=lambda x: (-x[1], random.random()))
     
-    return selected
+    return [name for name, _ in top]
 
 
 def select_highlights_with_rotation(
@@ -1826,11 +2107,68 @@ def get_category_override(brand_name: str) -> Optional[str]:
     return BRAND_CATEGORY_OVERRIDES.get(brand_lower)
 
 
+def lookup_brand_category(brand_name: str) -> Optional[str]:
+    """
+    Get the override category for the longest known brand that prefixes the name.
+    
+    Extends get_category_override to sub-brands and product lines
+    (e.g. "Whole Foods 365" -> "whole foods"). Prefixes are tried on word
+    boundaries, longest first, so each candidate is a single dict lookup.
+    """
+    brand_lower = " ".join(brand_name.lower().split())
+    end = len(brand_lower)
+    while end > 0:
+        category = BRAND_CATEGORY_OVERRIDES.get(brand_lower[:end])
+        if category is not None:
+            return category
+        end = brand_lower.rfind(" ", 0, end)
+    return None
+
+
+def _normalize_brand_text(text: str) -> str:
+    """Lowercase, drop apostrophes and collapse whitespace for brand matching."""
+    return " ".join(text.lower().replace("'", "").replace("\u2019", "").split())
+
+
+# Normalized brand spelling -> category ("dunkin'" and "dunkin" share one entry)
+_BRAND_VARIANTS: Dict[str, str] = {}
+for _brand, _brand_category in BRAND_CATEGORY_OVERRIDES.items():
+    _BRAND_VARIANTS.setdefault(_normalize_brand_text(_brand), _brand_category)
+
+# One alternation over every brand, longest first so the leftmost match is also the longest
+_BRAND_PATTERN = re.compile(
+    r"(?<!\w)(?:"
+    + "|".join(re.escape(brand) for brand in sorted(_BRAND_VARIANTS, key=len, reverse=True))
+    + r")(?!\w)"
+)
+
+
+def find_brand(text: str) -> Optional[str]:
+    """
+    Find the first known override brand mentioned in free text.
+    
+    Scans the text once with a single compiled pattern instead of checking each
+    override key as a substring. Apostrophe and whitespace variants match; the
+    normalized brand spelling is returned (e.g. "dunkin donuts").
+    """
+    if not text:
+        return None
+    match = _BRAND_PATTERN.search(_normalize_brand_text(text))
+    return match.group() if match is not None else None
+
+
+def detect_brand_category(text: str) -> Optional[str]:
+    """Get the override category for the first known brand mentioned in free text."""
+    brand = find_brand(text)
+    return _BRAND_VARIANTS[brand] if brand is not None else None
+
+
 # Log initialization
 app_logger.info(
     f"RJM Ingredient Canon 11.26.25 loaded: "
     f"{len(CATEGORY_PERSONA_MAP)} categories, "
     f"{len(PHYLUM_PERSONA_MAP)} phyla, "
+    f"{len(PERSONA_TO_PHYLUM)} phylum-mapped personas, "
     f"{len(GENERATIONS)} generations, "
     f"{len(MULTICULTURAL_EXPRESSIONS)} multicultural expressions, "
     f"{len(LOCAL_CULTURE_DMAS)} DMA segments, "
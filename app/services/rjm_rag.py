@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import re
-from typing import List
+from typing import List, Sequence
 
 from app.config.logger import app_logger
 from app.config.settings import settings
@@ -34,7 +34,7 @@ from app.services.rjm_vector_store import (
     get_pinecone_index,
 )
 from app.services.rjm_canon import (
-    get_canon_persona_prompt_list,
+    get_canon_persona_prompt_block,
 )
 
 
@@ -128,8 +128,8 @@ DO NOT lead with shopping personas like:
 def _build_system_prompt(
     canon_preview: str,
     inferred_category: str,
-    category_personas: List[str],
-    category_anchors: List[str],
+    category_personas: Sequence[str],
+    category_anchors: Sequence[str],
     generational_options: str,
     meaning_hint: str = "",
 ) -> str:
@@ -324,8 +324,7 @@ def generate_program_with_rag(request: GenerateProgramRequest) -> ProgramJSON:
         app_logger.error(exc)
         raise
 
-    canon_prompt_list = get_canon_persona_prompt_list()
-    canon_preview = ", ".join(canon_prompt_list)
+    canon_preview = get_canon_persona_prompt_block(", ")
 
     # LLM decides category (overrides disabled)
     inferred_category = infer_category_with_llm(request.brand_name, request.brief)
@@ -478,7 +477,7 @@ def generate_program_with_rag(request: GenerateProgramRequest) -> ProgramJSON:
     
     app_logger.info(
         f"PersonaAuthority built portfolio: {len(portfolio_names)} personas, "
-        f"diversity stats: {authority.context.get_phylum_distribution()}"
+        f"diversity stats: {dict(authority.context.get_phylum_distribution())}"
     )
 
     # === USE PERSONA AUTHORITY FOR GENERATIONAL SEGMENTS ===
@@ -592,7 +591,7 @@ def generate_program_with_rag(request: GenerateProgramRequest) -> ProgramJSON:
     # ═══════════════════════════════════════════════════════════════════════════
 
     # A. Multicultural Expressions - only when brief requires multicultural targeting
-    multicultural_overlays: List[str] = []
+    multicultural_overlays: Sequence[str] = []
     detected_lineage = detect_multicultural_lineage(request.brief)
     if detected_lineage:
         multicultural_overlays = get_multicultural_expressions(detected_lineage)[:5]
@@ -0,0 +1,229 @@
+"""
+Tests for RJM Ingredient Canon helpers.
+
+Covers:
+- Keyword category detection
+- Batch LLM category detection (stubbed OpenAI client)
+- Bulk brand-context analysis
+- Brand override lookups
+"""
+
+import json
+
+from unittest.mock import patch, MagicMock
+
+from app.services.rjm_ingredient_canon import (
+    analyze_brand_contexts,
+    detect_brand_category,
+    find_brand,
+    infer_category,
+    infer_categories_with_llm,
+    lookup_brand_category,
+)
+
+
+def _fake_client(content: str) -> MagicMock:
+    """Build a stand-in OpenAI client whose chat completion returns `content`."""
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=content))]
+    )
+    return client
+
+
+class TestInferCategory:
+    """Test cases for infer_category (keyword scan)."""
+
+    def test_first_matching_category_wins(self):
+        """When keywords from several categories match, the earlier category wins."""
+        assert infer_category("Burger combo with a streaming movie night") == "QSR"
+        assert infer_category("Fitness tracker launch") == "Health & Pharma"
+
+    def test_no_keyword_defaults_to_cpg(self):
+        """Text without any category keyword falls back to CPG."""
+        assert infer_category("") == "CPG"
+        assert infer_category("Zzz qwerty") == "CPG"
+
+
+class TestInferCategoriesWithLLM:
+    """Test cases for infer_categories_with_llm."""
+
+    def _run(self, pairs, content):
+        client = _fake_client(content)
+        with patch("app.services.rjm_vector_store.get_openai_client", return_value=client):
+            return infer_categories_with_llm(pairs), client
+
+    def test_empty_input_skips_llm(self):
+        """No pairs means no LLM call."""
+        result, client = self._run([], "{}")
+        assert result == []
+        client.chat.completions.create.assert_not_called()
+
+    def test_duplicate_pairs_sent_once(self):
+        """Duplicate pairs share one prompt row and map back in input order."""
+        pairs = [
+            ("Taco Bell", "Late night menu"),
+            ("Ford", "New truck launch"),
+            ("Taco Bell", "Late night menu"),
+        ]
+        result, client = self._run(pairs, json.dumps({"1": "QSR", "2": "Auto"}))
+
+        assert result == ["QSR", "Auto", "QSR"]
+        client.chat.completions.create.assert_called_once()
+        user_prompt = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "2. Brand: Ford" in user_prompt
+        assert "3. Brand:" not in user_prompt
+
+    def test_whitespace_variants_sent_once(self):
+        """Pairs that differ only in whitespace share one prompt row."""
+        pairs = [("Taco Bell", "Late night menu"), ("  Taco   Bell ", "Late night\n menu ")]
+        result, client = self._run(pairs, json.dumps({"1": "QSR"}))
+
+        assert result == ["QSR", "QSR"]
+        user_prompt = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "2. Brand:" not in user_prompt
+
+    def test_missing_row_falls_back_to_keywords(self):
+        """A row the LLM omits falls back to keyword detection."""
+        pairs = [("Taco Bell", "Late night menu"), ("Acme", "Streaming movie service")]
+        result, _ = self._run(pairs, json.dumps({"1": "QSR"}))
+
+        assert result == ["QSR", infer_category("Acme Streaming movie service")]
+
+    def test_unknown_category_falls_back_to_keywords(self):
+        """An answer that is not a canonical category falls back to keyword detection."""
+        pairs = [("Acme", "Luxury handbag collection")]
+        result, _ = self._run(pairs, json.dumps({"1": "Bananas"}))
+
+        assert result == [infer_category("Acme Luxury handbag collection")]
+
+    def test_answer_matched_case_insensitively(self):
+        """Canonical categories are recognised regardless of case or extra words."""
+        pairs = [("Ford", "New truck launch")]
+        result, _ = self._run(pairs, json.dumps({"1": "category: auto"}))
+
+        assert result == ["Auto"]
+
+    def test_invalid_json_falls_back_for_every_row(self):
+        """A reply that is not JSON falls back to keyword detection for the whole batch."""
+        pairs = [("Acme", "Streaming movie service"), ("Bolt", "Beer and spirits")]
+        result, _ = self._run(pairs, "QSR, Auto")
+
+        assert result == [
+            infer_category("Acme Streaming movie service"),
+            infer_category("Bolt Beer and spirits"),
+        ]
+
+
+class TestAnalyzeBrandContexts:
+    """Test cases for analyze_brand_contexts (analyze_brand_context stubbed)."""
+
+    @staticmethod
+    def _fake_analysis(brand_name, brief, category):
+        return {"brand_understanding": f"{brand_name}|{category}", "prioritize_personas": []}
+
+    def _run(self, items, **kwargs):
+        with patch(
+            "app.services.rjm_ingredient_canon.analyze_brand_context",
+            side_effect=self._fake_analysis,
+        ) as analyze:
+            return analyze_brand_contexts(items, **kwargs), analyze
+
+    def test_empty_input(self):
+        """No items means no analyses."""
+        result, analyze = self._run([])
+        assert result == []
+        analyze.assert_not_called()
+
+    def test_results_follow_input_order(self):
+        """One analysis per item, in input order, even with concurrent workers."""
+        items = [(f"Brand {i}", "Brief", "CPG") for i in range(12)]
+        result, _ = self._run(items, max_concurrency=4)
+
+        assert [row["brand_understanding"] for row in result] == [
+            f"Brand {i}|CPG" for i in range(12)
+        ]
+
+    def test_duplicates_analyzed_once(self):
+        """Items that share a cache key (case/whitespace variants) are analyzed once."""
+        items = [
+            ("Nike", "Running  shoes", "Sports & Fitness"),
+            ("Ford", "Trucks", "Auto"),
+            (" nike ", "Running shoes", "Sports & Fitness"),
+        ]
+        result, analyze = self._run(items)
+
+        assert analyze.call_count == 2
+        assert result[0] == result[2]
+        assert result[1]["brand_understanding"] == "Ford|Auto"
+
+    def test_duplicate_rows_are_independent_copies(self):
+        """Mutating one row never leaks into a duplicate row."""
+        items = [("Nike", "Shoes", "Sports & Fitness"), ("Nike", "Shoes", "Sports & Fitness")]
+        result, _ = self._run(items)
+
+        assert result[0] is not result[1]
+        result[0]["prioritize_personas"].append("Gym Obsessed")
+        assert result[1]["prioritize_personas"] == []
+
+
+class TestLookupBrandCategory:
+    """Test cases for lookup_brand_category (longest word-boundary prefix)."""
+
+    def test_exact_brand(self):
+        """A known brand maps to its override category."""
+        assert lookup_brand_category("Whole Foods") == "Retail & E-Commerce"
+
+    def test_sub_brand_uses_prefix(self):
+        """Sub-brands and product lines resolve through the parent brand."""
+        assert lookup_brand_category("Whole Foods 365") == "Retail & E-Commerce"
+        assert lookup_brand_category("Taco Bell Cantina") == "QSR"
+
+    def test_case_and_whitespace_insensitive(self):
+        """Case and extra whitespace do not affect the lookup."""
+        assert lookup_brand_category("  whole   foods") == "Retail & E-Commerce"
+        assert lookup_brand_category("TACO BELL") == "QSR"
+
+    def test_prefix_must_end_on_word_boundary(self):
+        """"Kroger" must not match inside a longer word."""
+        assert lookup_brand_category("Krogerville Farms") is None
+
+    def test_empty_and_unknown(self):
+        """Empty and unknown brands have no override."""
+        assert lookup_brand_category("") is None
+        assert lookup_brand_category("   ") is None
+        assert lookup_brand_category("Acme Widgets") is None
+
+
+class TestBrandDetection:
+    """Test cases for find_brand / detect_brand_category (free-text brand scan)."""
+
+    def test_straight_and_curly_apostrophes(self):
+        """Apostrophe variants normalize to the same brand."""
+        assert find_brand("Coupons at McDonald's this week") == "mcdonalds"
+        assert find_brand("Coupons at McDonald\u2019s this week") == "mcdonalds"
+        assert find_brand("Coupons at McDonalds this week") == "mcdonalds"
+        assert detect_brand_category("Weekly haul from Trader Joe\u2019s") == "Retail & E-Commerce"
+
+    def test_longest_brand_wins(self):
+        """The longest brand at a position wins over its prefix."""
+        assert find_brand("New menu at Dunkin Donuts") == "dunkin donuts"
+        assert find_brand("New menu at Dunkin' Donuts") == "dunkin donuts"
+        assert find_brand("Grab a coffee at Dunkin today") == "dunkin"
+        assert find_brand("Whole Foods Market grand opening") == "whole foods market"
+        assert detect_brand_category("New menu at Dunkin Donuts") == "QSR"
+
+    def test_first_mention_wins(self):
+        """With several brands in the text, the leftmost mention is returned."""
+        assert find_brand("Kroger shoppers who also love Taco Bell") == "kroger"
+
+    def test_whole_words_only(self):
+        """Brands inside longer words do not match."""
+        assert find_brand("A supersonic campaign") is None
+        assert find_brand("Subwayfarers unite") is None
+
+    def test_empty_and_unknown(self):
+        """Empty text and text without a known brand return None."""
+        assert find_brand("") is None
+        assert detect_brand_category("") is None
+        assert detect_brand_category("A regional hardware store") is None